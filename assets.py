@@ -0,0 +1,663 @@
+import os
+import sys
+import time
+import json
+import mmap
+import struct
+import hashlib
+import posixpath
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pygame
+
+
+ARCHIVE_PATH = os.path.join("export", "assets.pak")
+
+
+def portable_path(path):
+    """Path form stored in the archive index, the same on every platform"""
+    return posixpath.normpath(path.replace("\\", "/")).lower()
+
+
+# Colorkeys tried in turn; one the image's own opaque pixels do not use is picked
+COLORKEYS = [(255, 0, 255), (0, 255, 0), (0, 0, 255), (255, 0, 0), (1, 2, 3)]
+
+
+def alpha_kind(img):
+    """"opaque", "binary" (alpha only 0 or 255) or "soft"; needs no display, safe on any thread"""
+    if not img.get_flags() & pygame.SRCALPHA:
+        return "opaque"
+    histogram = np.bincount(pygame.surfarray.pixels_alpha(img).ravel(), minlength=256)
+    if histogram[255] == img.get_width() * img.get_height():
+        return "opaque"
+    return "soft" if histogram[1:255].any() else "binary"
+
+
+def choose_blit_path(img, kind=None):
+    """Fastest plain-blit representation of a decoded image, converted for the display.
+
+    Returns (surface, path) where path is
+      "opaque"   -- every pixel at full alpha: convert(), a plain copy blit
+      "colorkey" -- alpha only 0 or 255: convert() with a colorkey, RLE encoded
+      "alpha"    -- soft edges somewhere: convert_alpha() as usual
+    All three draw the same pixels with an ordinary blit(). kind is
+    alpha_kind(img) when the caller already has it.
+    """
+    kind = kind or alpha_kind(img)
+    if kind == "opaque":
+        return img.convert(), "opaque"
+    img = img.convert_alpha()
+    if kind == "soft":
+        return img, "alpha"
+    w, h = img.get_size()
+    solid = pygame.mask.from_surface(img, 254)
+    for key in COLORKEYS:
+        if pygame.mask.from_threshold(img, key + (255,), (1, 1, 1, 255)).overlap_area(solid, (0, 0)):
+            continue  # A visible pixel has this color
+        keyed = pygame.Surface((w, h)).convert()
+        keyed.fill(key)
+        keyed.blit(img, (0, 0))
+        keyed.set_colorkey(key, pygame.RLEACCEL)
+        return keyed, "colorkey"
+    return img, "alpha"
+
+
+def pixel_format(surface):
+    """(surface, "RGB" or "RGBA") to store; colorkeyed pixels are stored transparent"""
+    if surface.get_colorkey() is not None:
+        surface = surface.convert_alpha()
+    return surface, "RGBA" if surface.get_flags() & pygame.SRCALPHA else "RGB"
+
+
+class AssetArchive:
+    """Memory-mapped pack of already scaled, already decoded images.
+
+    Written offline by build_assets.py from a warmed AssetCache. Each index
+    entry maps a cache key (path + transform) to raw RGB/RGBA pixels, so a
+    load is a frombuffer() plus convert() with no PNG decode or scaling.
+    Entries whose source PNG changed since the build are ignored; the
+    check reads and CRCs each source once, then only stats it.
+
+    Layout: MAGIC, uint32 index length, JSON index, pixel data.
+    """
+
+    MAGIC = b"YO2PAK1\0"
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(self.MAGIC)] != self.MAGIC:
+            raise ValueError(f"{path} is not an asset archive")
+        header = len(self.MAGIC)
+        (index_length,) = struct.unpack_from("<I", self._map, header)
+        index_start = header + 4
+        index = json.loads(bytes(self._map[index_start:index_start + index_length]))
+        self.data_start = index_start + index_length
+        self.index = {self._index_key(entry["key"]): entry for entry in index}
+        self.hits = 0
+        self._stamps = {}  # path -> ((size, mtime_ns), source stamp)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _index_key(key):
+        path, size, scale, convert, smooth = key
+        return (portable_path(path), tuple(size) if size is not None else None, scale, convert, smooth)
+
+    @staticmethod
+    def _source_stamp(path):
+        """[size, crc32] of the source file; mtimes do not survive a fresh checkout"""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None  # Sources are not shipped, trust the archive
+        return [len(data), zlib.crc32(data)]
+
+    def source_stamp(self, path):
+        """_source_stamp(path), memoized until the file's size or mtime changes"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        stat = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            known = self._stamps.get(path)
+        if known is not None and known[0] == stat:
+            return known[1]
+        stamp = self._source_stamp(path)
+        with self._lock:
+            self._stamps[path] = (stat, stamp)
+        return stamp
+
+    def load(self, key):
+        """Surface for a cache key, or None when the archive has no (fresh) copy"""
+        entry = self.index.get(self._index_key(key))
+        if entry is None:
+            return None
+        stamp = self.source_stamp(key[0])
+        if stamp is not None and stamp != entry["source"]:
+            return None
+        start = self.data_start + entry["offset"]
+        pixels = memoryview(self._map)[start:start + entry["length"]]
+        self.hits += 1
+        # Copy out of the map so surfaces never pin it
+        return pygame.image.frombuffer(pixels, entry["size"], entry["format"]).copy()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    @classmethod
+    def write(cls, path, cache):
+        """Pack every surface currently in cache into a new archive at path"""
+        index = []
+        blobs = []
+        offset = 0
+        with cache.lock:
+            entries = [(key, entry[0]) for key, entry in cache._entries.items()]
+        for key, surface in entries:
+            surface, fmt = pixel_format(surface)
+            pixels = pygame.image.tobytes(surface, fmt)
+            index.append({
+                "key": [portable_path(key[0])] + list(key[1:]),
+                "offset": offset,
+                "length": len(pixels),
+                "size": list(surface.get_size()),
+                "format": fmt,
+                "source": cls._source_stamp(key[0]),
+            })
+            blobs.append(pixels)
+            offset += len(pixels)
+        index_data = json.dumps(index).encode()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(cls.MAGIC)
+            f.write(struct.pack("<I", len(index_data)))
+            f.write(index_data)
+            for pixels in blobs:
+                f.write(pixels)
+        os.replace(tmp_path, path)
+        return len(index), offset
+
+
+class ScaledDiskCache:
+    """On-disk copies of rescaled images, for resolutions the archive was not built for.
+
+    smoothscale of full-screen art at 1600x1200 costs tens of milliseconds per
+    image, so each result is written once as raw pixels and read back on later
+    launches. Files are named after the SHA-1 of the source PNG plus the
+    transform, so an edited PNG simply misses and gets scaled again.
+
+    File layout: MAGIC, uint16 width, uint16 height, uint8 bytes per pixel, pixels.
+    """
+
+    MAGIC = b"YO2SCL1\0"
+    HEADER = struct.Struct("<8sHHB")
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._hashes = {}  # path -> ((size, mtime_ns), sha1 hex)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stores = 0
+
+    def source_hash(self, path):
+        """SHA-1 of the source file, memoized until its size or mtime changes"""
+        st = os.stat(path)
+        stamp = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            known = self._hashes.get(path)
+        if known is not None and known[0] == stamp:
+            return known[1]
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        with self._lock:
+            self._hashes[path] = (stamp, digest)
+        return digest
+
+    def file_for(self, key):
+        path, size, scale, convert, smooth = key
+        try:
+            digest = self.source_hash(path)
+        except OSError:
+            return None
+        transform = f"{size[0]}x{size[1]}" if size is not None else f"x{scale!r}"
+        name = f"{digest}_{transform}_{convert or 'raw'}{'_smooth' if smooth else ''}.bin"
+        return os.path.join(self.directory, name)
+
+    def load(self, key):
+        """Surface for a cache key, or None when nothing is stored for it yet"""
+        file_path = self.file_for(key)
+        if file_path is None:
+            return None
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < self.HEADER.size:
+            return None  # Empty or cut short, e.g. by a crash mid-write; rescaled and stored again
+        magic, width, height, depth = self.HEADER.unpack_from(data)
+        pixels = memoryview(data)[self.HEADER.size:]
+        if magic != self.MAGIC or depth not in (3, 4) or len(pixels) != width * height * depth:
+            return None
+        self.hits += 1
+        return pygame.image.frombuffer(pixels, (width, height), "RGBA" if depth == 4 else "RGB").copy()
+
+    def store(self, key, surface):
+        file_path = self.file_for(key)
+        if file_path is None:
+            return
+        surface, fmt = pixel_format(surface)
+        alpha = fmt == "RGBA"
+        pixels = pygame.image.tobytes(surface, fmt)
+        width, height = surface.get_size()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Loader threads may store the same key at once; last rename wins
+            tmp_path = f"{file_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(self.HEADER.pack(self.MAGIC, width, height, 4 if alpha else 3))
+                f.write(pixels)
+            os.replace(tmp_path, file_path)
+            self.stores += 1
+        except OSError as e:
+            print(f"Error writing scaled image cache {file_path}: {e}")
+
+
+class AssetCache:
+    """Process-wide image cache shared by every scene.
+
+    Entries are keyed by the normalized path plus the transform applied to it
+    (target size or scale factor, scaler and convert mode), so asking for the
+    same asset twice never decodes the PNG again. Each entry is reference
+    counted; entries nobody holds any more stay cached until the byte budget
+    is exceeded, then the least recently used ones are evicted first.
+
+    Loads may come from a scene loader thread: decoding happens outside the
+    lock, so the main thread is never blocked behind a PNG decode.
+
+    Decoding is split in two: reading (PNG decode or archive copy, then
+    scaling), which does not touch the display and runs on any thread with
+    SDL releasing the GIL, and converting to the display format, which
+    load() does on the calling thread. prefetch() and prefetch_many() do
+    only the reading, on worker threads, and park the result until the
+    matching load() converts it.
+    """
+
+    def __init__(self, budget_bytes=96 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()  # key -> [surface, refcount, nbytes]
+        self._keys = {}  # id(surface) -> key, used by release()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_used = 0
+        self.lock = threading.RLock()
+        self.archive = None  # AssetArchive consulted before decoding PNGs
+        self.disk_cache = None  # ScaledDiskCache for rescaled images the archive lacks
+        self.blit_paths = {}  # key -> what convert="auto" chose, see choose_blit_path()
+        self._decoded = {}  # key -> (surface, alpha kind) read but not yet converted, from prefetch()
+        self.workers = os.cpu_count() or 1  # Default pool size of prefetch_many()
+        self.last_batch = None  # Timings of the last prefetch_many() that had anything to read
+
+    @staticmethod
+    def normalize_path(path):
+        """Accept both the Windows style paths used across the game and native ones"""
+        return os.path.normcase(os.path.normpath(path.replace("\\", "/")))
+
+    @staticmethod
+    def surface_bytes(surface):
+        return surface.get_pitch() * surface.get_height()
+
+    def make_key(self, path, size=None, scale=None, convert="alpha", smooth=False):
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+        return (self.normalize_path(path), size, scale, convert, smooth)
+
+    def load(self, path, size=None, scale=None, convert="alpha", smooth=False, retain=True):
+        """Return the (transformed) surface for path, decoding it only on a miss.
+
+        size     -- stretch to this exact (width, height)
+        scale    -- or scale both sides by this factor
+        convert  -- "alpha" for convert_alpha(), "opaque" for convert(), None to keep as decoded,
+                    "auto" to pick opaque, colorkey or alpha from the (scaled) pixels
+        smooth   -- use smoothscale instead of scale
+        retain   -- take a reference; balance it with release() when done
+        """
+        key = self.make_key(path, size, scale, convert, smooth)
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                if retain:
+                    entry[1] += 1
+                return entry[0]
+        surface = self._decode(key)
+        with self.lock:
+            # Another thread may have decoded the same key meanwhile
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                entry = [surface, 0, self.surface_bytes(surface)]
+                self._entries[key] = entry
+                self._keys[id(surface)] = key
+                self.bytes_used += entry[2]
+            else:
+                self.hits += 1
+            if retain:
+                entry[1] += 1
+            self._evict()
+            return entry[0]
+
+    def _read(self, key):
+        """(surface, alpha kind) for key, not yet in the display format; safe on any thread.
+
+        The alpha kind is only worked out for convert="auto", otherwise None.
+        """
+        img = self._read_pixels(key)
+        return img, alpha_kind(img) if key[3] == "auto" else None
+
+    def _read_pixels(self, key):
+        path, size, scale, convert, smooth = key
+        packed = self.archive.load(key) if self.archive is not None else None
+        scaled = self.disk_cache is not None and (size is not None or scale is not None)
+        if packed is None and scaled:
+            packed = self.disk_cache.load(key)
+        if packed is not None:
+            return packed  # Already scaled when the archive or disk copy was written
+        img = pygame.image.load(path)
+        if convert is not None and (img.get_colorkey() is not None or img.get_bitsize() not in (24, 32)):
+            # Palette or colorkeyed PNG: expand to RGBA first, the scalers need 24/32 bits
+            rgba = pygame.Surface(img.get_size(), pygame.SRCALPHA, 32)
+            rgba.blit(img, (0, 0))
+            img = rgba
+        if scale is not None:
+            w, h = img.get_size()
+            size = (int(w * scale), int(h * scale))
+        if size is not None and size != img.get_size():
+            scaler = pygame.transform.smoothscale if smooth else pygame.transform.scale
+            img = scaler(img, size)
+            if scaled:
+                self.disk_cache.store(key, img)
+        return img
+
+    def _decode(self, key):
+        with self.lock:
+            read = self._decoded.pop(key, None)
+        if read is None:
+            read = self._read(key)
+        return self._finish(key, *read)
+
+    def _finish(self, key, img, kind=None):
+        """Convert a read surface to the display format; needs the display, so main thread"""
+        convert = key[3]
+        if convert == "alpha":
+            img = img.convert_alpha()
+        elif convert == "opaque":
+            img = img.convert()
+        elif convert == "auto":
+            # Decided after scaling: smoothscale turns hard edges soft
+            img, blit_path = choose_blit_path(img, kind)
+            with self.lock:
+                self.blit_paths[key] = blit_path
+        return img
+
+    def prefetch(self, path, size=None, scale=None, convert="alpha", smooth=False):
+        """Read (decode and scale) an image ahead of its load(); for loader threads"""
+        self._prefetch_key(self.make_key(path, size, scale, convert, smooth))
+
+    def _prefetch_key(self, key):
+        """Read key unless it is cached or read already; returns the CPU ms spent"""
+        with self.lock:
+            if key in self._entries or key in self._decoded:
+                return 0.0
+        # Thread CPU time, so threads waiting on each other do not count as work
+        start = time.thread_time()
+        read = self._read(key)
+        with self.lock:
+            self._decoded.setdefault(key, read)
+        return (time.thread_time() - start) * 1000
+
+    def prefetch_many(self, requests, workers=None):
+        """Read several images on a thread pool; requests are (path, load() options) pairs.
+
+        Read errors are left for the matching load() to raise. Timings land in
+        last_batch: wall_ms against job_ms, the CPU time of all reads, shows
+        the parallel speedup.
+        """
+        keys = list(dict.fromkeys(self.make_key(path, **options) for path, options in requests))
+        with self.lock:
+            keys = [key for key in keys if key not in self._entries and key not in self._decoded]
+        workers = max(1, min(len(keys), workers or self.workers))
+        start = time.perf_counter()
+
+        def read(key):
+            try:
+                return self._prefetch_key(key)
+            except Exception:
+                return 0.0  # load() reads it again and reports the error
+
+        if len(keys) > 1 and workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="AssetRead") as pool:
+                job_ms = sum(pool.map(read, keys))
+        else:
+            job_ms = sum(map(read, keys))
+        batch = {
+            "jobs": len(keys),
+            "workers": workers,
+            "wall_ms": (time.perf_counter() - start) * 1000,
+            "job_ms": job_ms,
+        }
+        if keys:
+            self.last_batch = batch
+        return batch
+
+    def load_many(self, requests, workers=None, retain=True):
+        """load() for each (path, options) pair, read in parallel first; converts on this thread"""
+        self.prefetch_many(requests, workers)
+        return [self.load(path, retain=retain, **options) for path, options in requests]
+
+    def release(self, surface):
+        """Drop one reference taken by load(); the entry becomes evictable at zero"""
+        with self.lock:
+            key = self._keys.get(id(surface))
+            entry = self._entries.get(key) if key is not None else None
+            if entry is None or entry[1] == 0:
+                return
+            entry[1] -= 1
+            self._evict()
+
+    def _evict(self):
+        if self.bytes_used <= self.budget_bytes:
+            return
+        for key in list(self._entries):
+            if self.bytes_used <= self.budget_bytes:
+                break
+            if self._entries[key][1] > 0:
+                continue  # Still in use by a scene, never evict
+            self._drop(key)
+
+    def _drop(self, key):
+        surface, refcount, nbytes = self._entries.pop(key)
+        del self._keys[id(surface)]
+        self.bytes_used -= nbytes
+        self.evictions += 1
+
+    def trim(self):
+        """Evict every entry nobody holds a reference to, whatever the budget (scene switches)"""
+        with self.lock:
+            for key in [key for key, entry in self._entries.items() if entry[1] == 0]:
+                self._drop(key)
+
+    def clear(self):
+        """Forget every entry, including ones still referenced, and the stats about them"""
+        with self.lock:
+            self._entries.clear()
+            self._keys.clear()
+            self._decoded.clear()
+            self.blit_paths.clear()
+            self.bytes_used = 0
+            self.hits = self.misses = self.evictions = 0
+            self.last_batch = None
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.bytes_used,
+            "budget": self.budget_bytes,
+            "disk_hits": self.disk_cache.hits if self.disk_cache is not None else 0,
+            "blit_paths": {path: sum(1 for chosen in self.blit_paths.values() if chosen == path)
+                           for path in ("opaque", "colorkey", "alpha")},
+        }
+
+
+# Shared instance used by mouse.py, menu.py, background.py and intro.py
+cache = AssetCache()
+
+
+def load_image(path, size=None, scale=None, convert="alpha", smooth=False, retain=True):
+    return cache.load(path, size=size, scale=scale, convert=convert, smooth=smooth, retain=retain)
+
+
+def release_image(surface):
+    cache.release(surface)
+
+
+def prefetch_image(path, size=None, scale=None, convert="alpha", smooth=False):
+    cache.prefetch(path, size=size, scale=scale, convert=convert, smooth=smooth)
+
+
+def load_images(requests, workers=None, retain=True):
+    return cache.load_many(requests, workers=workers, retain=retain)
+
+
+def batch_report(batch=None):
+    """One line on a prefetch_many() batch: wall time against the summed decode time"""
+    batch = batch if batch is not None else cache.last_batch
+    if not batch or not batch["jobs"]:
+        return "No images decoded"
+    speedup = batch["job_ms"] / batch["wall_ms"] if batch["wall_ms"] else 0.0
+    return (f"Decoded {batch['jobs']} images on {batch['workers']} threads in {batch['wall_ms']:.1f} ms "
+            f"({batch['job_ms']:.1f} ms of decoding, {speedup:.2f}x)")
+
+
+def use_archive(path=ARCHIVE_PATH):
+    """Serve loads from a pre-decoded archive when one exists; returns whether it does"""
+    if not os.path.exists(path):
+        return False
+    try:
+        cache.archive = AssetArchive(path)
+    except (OSError, ValueError) as e:
+        print(f"Error opening asset archive {path}: {e}")
+        return False
+    return True
+
+
+_sounds = {}
+_sounds_lock = threading.Lock()
+
+def load_sound(path):
+    """Shared pygame.mixer.Sound per normalized path, until release_sound()"""
+    key = AssetCache.normalize_path(path)
+    with _sounds_lock:
+        sound = _sounds.get(key)
+    if sound is None:
+        sound = pygame.mixer.Sound(key)
+        with _sounds_lock:
+            sound = _sounds.setdefault(key, sound)
+    return sound
+
+
+def release_sound(path):
+    """Forget the shared Sound for path; it is freed once nobody else holds it"""
+    with _sounds_lock:
+        _sounds.pop(AssetCache.normalize_path(path), None)
+
+
+def release_sounds():
+    """Forget every shared Sound, e.g. when the mixer they were made for has quit"""
+    with _sounds_lock:
+        _sounds.clear()
+
+
+def bench_blit_paths(blits=300):
+    """Per-asset blit cost of the path convert="auto" picks, against plain convert_alpha()"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import menu
+    import background
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    loads = [(path, dict(scale=scale, smooth=True)) for path, scale in menu.TITLE_IMAGES]
+    loads += [(path, dict(size=(800, 600))) for path, speed in background.MENU_LAYERS]
+    loads.append((r"export\data\menu\menu_bg_01.png", dict(size=(800, 600))))
+
+    def cost(surface, flags=0):
+        start = time.perf_counter()
+        for _ in range(blits):
+            screen.blit(surface, (0, 0), special_flags=flags)
+        return (time.perf_counter() - start) * 1e6 / blits
+
+    def row(name, straight, chosen, blit_path):
+        premultiplied = straight.premul_alpha()
+        print(f"{name:28} {blit_path:>8}: {cost(chosen):7.1f} us  (convert_alpha {cost(straight):7.1f} us, "
+              f"premultiplied {cost(premultiplied, pygame.BLEND_PREMULTIPLIED):7.1f} us)")
+
+    for path, transform in loads:
+        try:
+            straight = cache.load(path, convert="alpha", retain=False, **transform)
+            chosen = cache.load(path, convert="auto", retain=False, **transform)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Error loading image {path}: {e}")
+            continue
+        row(os.path.basename(path.replace("\\", "/")), straight, chosen,
+            cache.blit_paths[cache.make_key(path, convert="auto", **transform)])
+    # None of the shipped art has hard-edged alpha; threshold a logo to show that path
+    logo = cache.load(menu.TITLE_LOGO, scale=menu.LOGO_SCALE, smooth=True, retain=False)
+    solid = logo.copy()
+    solid.fill((0, 0, 0, 255), special_flags=pygame.BLEND_RGBA_MAX)  # Same colors, full alpha
+    hard = pygame.mask.from_surface(logo, 127).to_surface(setsurface=solid, unsetcolor=(0, 0, 0, 0))
+    keyed, blit_path = choose_blit_path(hard)
+    row("title logo, alpha >= 128", hard, keyed, blit_path)
+    pygame.quit()
+
+
+def bench_load_many(sizes=((800, 600), (1600, 1200)), runs=3):
+    """Title screen image reads on one thread against the pool, plus the main-thread convert"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from menu import Menu
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    print(f"{os.cpu_count()} CPUs")
+    for size in sizes:
+        requests = Menu.image_requests(size)
+        for workers in sorted({1, cache.workers}):
+            best = None
+            for _ in range(runs):
+                cache.clear()
+                batch = cache.prefetch_many(requests, workers)
+                start = time.perf_counter()
+                for path, options in requests:
+                    cache.load(path, retain=False, **options)
+                convert_ms = (time.perf_counter() - start) * 1000
+                if best is None or batch["wall_ms"] < best[0]["wall_ms"]:
+                    best = (batch, convert_ms)
+            print(f"{size[0]}x{size[1]}: {batch_report(best[0])}, then {best[1]:.1f} ms converting")
+    cache.clear()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        bench_blit_paths()
+    elif "--load" in sys.argv:
+        bench_load_many()
@@ -0,0 +1,192 @@
+import os
+import sys
+import math
+import pygame
+
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+class TextureAtlas:
+    """Packs small sprites into a few large pages at load time.
+
+    pack() places sprites on shelves (tallest first) in pages about as wide
+    as they are tall, copies their pixels into pages trimmed to the space
+    actually used, and hands back a subsurface of its page for every
+    sprite. Those behave like the original surfaces everywhere (sizes,
+    masks, blits) and a SpriteBatch can draw all sprites of one page with a
+    single Surface.blits() call.
+
+    Sprites larger than max_page_size are returned as they are.
+    """
+
+    def __init__(self, max_page_size=(2048, 2048), padding=1):
+        self.max_page_size = max_page_size
+        self.padding = padding
+        self.pages = []
+        self.sprite_bytes = 0  # What the packed sprites took as separate surfaces
+        self.sprite_count = 0
+        self._premultiplied = {}  # id(page) -> premultiplied copy
+
+    def pack(self, surfaces):
+        """Pack surfaces into new pages; returns a list of subsurfaces in the same order"""
+        max_w, max_h = self.max_page_size
+        pad = self.padding
+        order = sorted(range(len(surfaces)), key=lambda i: surfaces[i].get_height(), reverse=True)
+        fits = [surfaces[i].get_size() for i in order
+                if surfaces[i].get_width() <= max_w and surfaces[i].get_height() <= max_h]
+        shelf_w = max_w
+        if fits:
+            # Shelves as wide as a square holding every sprite, and at least the widest one
+            area = sum((w + pad) * (h + pad) for w, h in fits)
+            shelf_w = min(max_w, max(max(w for w, h in fits), math.ceil(math.sqrt(area))))
+        placements = {}  # index -> (page, x, y)
+        page_sizes = []
+        x = y = shelf_h = 0
+        page = None
+        for i in order:
+            w, h = surfaces[i].get_size()
+            if w > max_w or h > max_h:
+                continue  # Too big to share a page
+            if page is None or x + w > shelf_w:
+                x, y, shelf_h = 0, y + shelf_h + (pad if shelf_h else 0), 0
+            if page is None or y + h > max_h:
+                page_sizes.append([0, 0])
+                page = len(page_sizes) - 1
+                x = y = shelf_h = 0
+            placements[i] = (page, x, y)
+            page_sizes[page][0] = max(page_sizes[page][0], x + w)
+            page_sizes[page][1] = max(page_sizes[page][1], y + h)
+            x += w + pad
+            shelf_h = max(shelf_h, h)
+
+        pages = [pygame.Surface(size, pygame.SRCALPHA).convert_alpha() for size in page_sizes]
+        result = list(surfaces)
+        for i, (page, x, y) in placements.items():
+            sprite = surfaces[i]
+            target = pages[page]
+            target.fill((0, 0, 0, 0), (x, y, *sprite.get_size()))
+            if sprite.get_colorkey() is not None:
+                sprite = sprite.convert_alpha()  # MAX would copy the key color too
+            # MAX onto transparent black copies the pixels exactly, a normal
+            # alpha blit would darken the soft edges
+            target.blit(sprite, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+            result[i] = target.subsurface((x, y, *sprite.get_size()))
+            self.sprite_bytes += surface_bytes(sprite)
+            self.sprite_count += 1
+        self.pages.extend(pages)
+        return result
+
+    def clear(self):
+        """Drop every page; sprites handed out by pack() keep theirs alive until they go too"""
+        self.pages.clear()
+        self._premultiplied.clear()
+
+    def page_bytes(self):
+        return sum(surface_bytes(page) for page in self.pages)
+
+    def premultiplied(self, page):
+        """Premultiplied-alpha copy of a page, made once"""
+        copy = self._premultiplied.get(id(page))
+        if copy is None:
+            copy = self._premultiplied[id(page)] = page.premul_alpha()
+        return copy
+
+    def report(self):
+        return (f"{self.sprite_count} sprites in {len(self.pages)} page(s): "
+                f"{self.page_bytes() / 1024:.0f} KiB vs {self.sprite_bytes / 1024:.0f} KiB as separate surfaces")
+
+
+class SpriteBatch:
+    """Collects blits and issues one Surface.blits() per atlas page per layer.
+
+    Sprites that are subsurfaces (of an atlas page) are drawn from their
+    page with a source rect; any other surface counts as a page of its own.
+    Layers are flushed in ascending order; within a layer, sprites keep
+    their order only relative to others on the same page, so sprites that
+    overlap and live on different pages belong in different layers.
+
+    A batch drawn into every frame (the cursor) can be kept and reused: its
+    per-page lists and sprite source rects survive flush(), so a steady
+    frame allocates only what blits() itself needs.
+    """
+
+    def __init__(self, target, atlas=None):
+        self.target = target
+        self.atlas = atlas  # For premultiplied page copies
+        self.layers = {}  # layer -> {id(page): (page, [(area, dest)])}
+        self._sources = {}  # id(sprite) -> (sprite, page, area)
+        self.calls = 0  # blits() calls made by the last flush
+        self.sprites = 0  # Sprites drawn by the last flush
+
+    def draw(self, sprite, dest, layer=0):
+        source = self._sources.get(id(sprite))
+        if source is None:
+            page = sprite.get_parent()
+            if page is None:
+                page, area = sprite, None
+            else:
+                area = pygame.Rect(sprite.get_offset(), sprite.get_size())
+            source = self._sources[id(sprite)] = (sprite, page, area)  # Holding sprite keeps its id
+        page, area = source[1], source[2]
+        groups = self.layers.get(layer)
+        if groups is None:
+            groups = self.layers[layer] = {}
+        group = groups.get(id(page))
+        if group is None:
+            group = groups[id(page)] = (page, [])
+        group[1].append((area, dest))
+
+    def flush(self, premultiplied=False):
+        """Draw everything queued; returns the rects touched"""
+        rects = []
+        self.calls = 0
+        self.sprites = 0
+        flags = pygame.BLEND_PREMULTIPLIED if premultiplied else 0
+        for layer in sorted(self.layers):
+            for page, items in self.layers[layer].values():
+                if not items:
+                    continue
+                source = page
+                if premultiplied:
+                    source = (self.atlas.premultiplied(page) if self.atlas is not None and page in self.atlas.pages
+                              else page.convert_alpha().premul_alpha())
+                rects.extend(self.target.blits([(source, dest, area, flags) for area, dest in items]))
+                self.calls += 1
+                self.sprites += len(items)
+                items.clear()
+        return rects
+
+
+def bench_atlas(frames=600):
+    """Blit calls and memory of the title screen and cursor with and without atlases"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import time
+    from menu import Menu
+    from mouse import Mouse
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    menu = Menu(screen)
+    mouse = Mouse(screen)
+    print(f"menu atlas:  {menu.atlas.report()}")
+    print(f"mouse atlas: {mouse.atlas.report()}")
+    menu.use_static_cache = False  # Every element drawn every frame
+    for batched in (False, True):
+        menu.use_sprite_batch = batched
+        mouse.use_sprite_batch = batched
+        start = time.perf_counter()
+        for _ in range(frames):
+            menu.update()
+            mouse.update()
+        elapsed = (time.perf_counter() - start) * 1000 / frames
+        print(f"{'batched' if batched else 'one blit per sprite':>19}: {elapsed:.3f} ms/frame, "
+              f"title {menu.blit_calls} blit calls, cursor {mouse.blit_calls}")
+    menu.cleanup()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        bench_atlas()
@@ -0,0 +1,339 @@
+import os
+import sys
+import time
+import wave
+import array
+import math
+import threading
+import pygame
+import assets
+
+# Mixer buffer in samples: smaller starts sounds sooner, too small crackles
+MIXER_FREQUENCY = 44100
+MIXER_BUFFER = 512
+MIXER_BUFFER_IN_USE = [MIXER_BUFFER]  # What pre_init() last asked for
+
+
+def pre_init(buffer=MIXER_BUFFER, frequency=MIXER_FREQUENCY):
+    """Call before pygame.init() so the mixer opens with our buffer size"""
+    pygame.mixer.pre_init(frequency, -16, 2, buffer)
+    MIXER_BUFFER_IN_USE[0] = buffer
+
+
+def buffer_latency_ms():
+    """Worst-case delay the mixer buffer adds before a sound is heard"""
+    init = pygame.mixer.get_init()
+    if init is None:
+        return 0.0
+    return MIXER_BUFFER_IN_USE[0] / init[0] * 1000
+
+
+class MusicPlayer:
+    """Streamed background music with fades between scene tracks.
+
+    Tracks play through pygame.mixer.music, which decodes from disk as it
+    plays instead of holding the whole file as a Sound. SDL_mixer has a
+    single music stream, so switching scenes fades the old track out and
+    then fades the new one in; the old stream is unloaded before the new one
+    opens. preload() reads a track ahead of time (run it on a loader thread)
+    so the open on the scene switch comes from the OS file cache.
+    """
+
+    def __init__(self, volume=0.8):
+        self.volume = volume
+        self.current = None
+        self.pending = None  # (path, fade_ms, loops) waiting for the fade-out
+        self.fading_out = False
+        self.tracks = {}  # path -> {"file_bytes", "preload_ms", "load_ms", "sound_bytes"}
+        self.queue = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available():
+        return pygame.mixer.get_init() is not None
+
+    def _stats(self, path):
+        with self._lock:
+            return self.tracks.setdefault(path, {"file_bytes": None, "preload_ms": None,
+                                                 "load_ms": None, "sound_bytes": None})
+
+    def preload(self, path):
+        """Read a track once so opening it later does not wait on the disk"""
+        path = assets.AssetCache.normalize_path(path)
+        stats = self._stats(path)
+        start = time.perf_counter()
+        size = 0
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(1 << 20)
+                if not chunk:
+                    break
+                size += len(chunk)
+        stats["file_bytes"] = size
+        stats["preload_ms"] = (time.perf_counter() - start) * 1000
+        stats["sound_bytes"] = self._decoded_bytes(path)
+        return stats
+
+    def queue_ahead(self, path):
+        """Remember path as the next track and preload it (call from a loader thread)"""
+        self.queue.append(assets.AssetCache.normalize_path(path))
+        return self.preload(path)
+
+    @staticmethod
+    def _decoded_bytes(path):
+        """What the track would cost resident as a mixer Sound (WAV only)"""
+        if not path.lower().endswith(".wav"):
+            return None
+        try:
+            with wave.open(path, "rb") as w:
+                seconds = w.getnframes() / w.getframerate()
+        except (OSError, wave.Error, EOFError):
+            return None
+        init = pygame.mixer.get_init()
+        if init is None:
+            return None
+        freq, fmt, channels = init
+        return int(seconds * freq * channels * abs(fmt) // 8)
+
+    def play(self, path, fade_ms=1000, loops=-1):
+        """Switch to path, fading out whatever is playing first"""
+        if not self.available():
+            return
+        path = assets.AssetCache.normalize_path(path)
+        if self.queue and self.queue[0] == path:
+            self.queue.pop(0)
+        if self.current is not None and pygame.mixer.music.get_busy():
+            self.pending = (path, fade_ms, loops)
+            if not self.fading_out:
+                pygame.mixer.music.fadeout(fade_ms)
+                self.fading_out = True
+            return
+        self._start(path, fade_ms, loops)
+
+    def _start(self, path, fade_ms, loops):
+        self.release()
+        stats = self._stats(path)
+        start = time.perf_counter()
+        pygame.mixer.music.load(path)
+        stats["load_ms"] = (time.perf_counter() - start) * 1000
+        pygame.mixer.music.set_volume(self.volume)
+        pygame.mixer.music.play(loops=loops, fade_ms=fade_ms)
+        self.current = path
+
+    def update(self):
+        """Call once per frame: starts the pending track once the fade-out is done"""
+        if not self.fading_out or not self.available():
+            return
+        if pygame.mixer.music.get_busy():
+            return
+        self.fading_out = False
+        if self.pending is not None:
+            path, fade_ms, loops = self.pending
+            self.pending = None
+            self._start(path, fade_ms, loops)
+        else:
+            self.release()
+
+    def stop(self, fade_ms=0):
+        """Stop the current track; the stream is released now or when the fade ends"""
+        self.pending = None
+        if not self.available() or self.current is None:
+            return
+        if fade_ms > 0 and pygame.mixer.music.get_busy():
+            pygame.mixer.music.fadeout(fade_ms)
+            self.fading_out = True
+        else:
+            self.release()
+
+    def release(self):
+        """Close the current stream right away"""
+        if self.current is None or not self.available():
+            self.current = None
+            return
+        pygame.mixer.music.stop()
+        pygame.mixer.music.unload()
+        self.current = None
+        self.fading_out = False
+
+    def report(self):
+        lines = []
+        for path, stats in self.tracks.items():
+            name = os.path.basename(path)
+            load = f"{stats['load_ms']:.1f} ms" if stats["load_ms"] is not None else "not played"
+            preload = f"{stats['preload_ms']:.1f} ms" if stats["preload_ms"] is not None else "none"
+            avoided = (f", {stats['sound_bytes'] / 1024 / 1024:.1f} MiB not resident as a Sound"
+                       if stats["sound_bytes"] else "")
+            lines.append(f"Music {name}: open {load}, preload {preload}{avoided}")
+        return lines
+
+
+class SfxBank:
+    """Short sound effects, preloaded once, on reserved mixer channels.
+
+    Each category (UI, duel, voice) owns a fixed block of channels that
+    pygame never hands to Sound.play(), so a burst of duel effects cannot
+    delay a button click. When a category is full, the new sound steals
+    the channel of the lowest-priority, oldest sound in that category, as
+    long as that sound's priority is not higher than its own.
+
+    mark_input(event) is called by the main loop for every event it pumps;
+    play() then logs how long it took from the event's arrival (its own
+    timestamp, like Mouse.note_input) to the sound starting, plus the
+    mixer buffer delay.
+    """
+
+    CATEGORIES = {"ui": 4, "duel": 8, "voice": 2}
+
+    def __init__(self, categories=None):
+        self.categories = dict(categories or self.CATEGORIES)
+        self.sounds = {}  # name -> (Sound, category, priority)
+        self.channels = None  # category -> [Channel]
+        self.playing = {}  # channel id -> (priority, start time, name)
+        self.input_time = None
+        self.latencies = []  # (name, input to play() ms, buffer ms)
+        self.steals = 0
+        self.dropped = 0
+
+    def _ensure_channels(self):
+        if self.channels is not None:
+            return True
+        if pygame.mixer.get_init() is None:
+            return False
+        total = sum(self.categories.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), total + 8))
+        pygame.mixer.set_reserved(total)  # Reserved channels come first
+        self.channels = {}
+        index = 0
+        for category, count in self.categories.items():
+            self.channels[category] = [pygame.mixer.Channel(index + i) for i in range(count)]
+            index += count
+        return True
+
+    def load(self, name, path, category="ui", volume=1.0, priority=0):
+        """Decode a sound once; returns it, or None when the file is missing (reported, then ignored)"""
+        if category not in self.categories:
+            raise ValueError(f"unknown sound category {category!r}")
+        if not self._ensure_channels():
+            return None
+        try:
+            sound = assets.load_sound(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Error loading sound {path}: {e}")
+            return None
+        sound.set_volume(volume)
+        self.sounds[name] = (sound, category, priority)
+        return sound
+
+    def remove(self, name):
+        """Forget a sound, stopping it first if it is playing"""
+        entry = self.sounds.pop(name, None)
+        if entry is not None:
+            entry[0].stop()
+
+    def add(self, name, sound, category="ui", priority=0):
+        """Register an already built Sound (e.g. generated in code)"""
+        if not self._ensure_channels():
+            return False
+        self.sounds[name] = (sound, category, priority)
+        return True
+
+    def mark_input(self, event=None, timestamp=None):
+        """Start the latency clock (timestamp: perf_counter() seconds when the event arrived)"""
+        if timestamp is None:
+            # pygame does not pass SDL's event timestamps on; tests can post their own
+            timestamp = getattr(event, "timestamp", None) or time.perf_counter()
+        self.input_time = timestamp
+
+    def play(self, name):
+        entry = self.sounds.get(name)
+        if entry is None or self.channels is None:
+            return None
+        sound, category, priority = entry
+        channel = self._pick_channel(category, priority)
+        if channel is None:
+            self.dropped += 1
+            return None
+        channel.play(sound)
+        now = time.perf_counter()
+        self.playing[id(channel)] = (priority, now, name)
+        if self.input_time is not None:
+            self.latencies.append((name, (now - self.input_time) * 1000, buffer_latency_ms()))
+            self.input_time = None
+        return channel
+
+    def _pick_channel(self, category, priority):
+        channels = self.channels[category]
+        for channel in channels:
+            if not channel.get_busy():
+                return channel
+        # Voice stealing: lowest priority first, then the oldest
+        victim = min(channels, key=lambda c: self.playing.get(id(c), (0, 0.0, None))[:2])
+        victim_priority = self.playing.get(id(victim), (0, 0.0, None))[0]
+        if victim_priority > priority:
+            return None
+        victim.stop()
+        self.steals += 1
+        return victim
+
+    def latency_report(self):
+        if not self.latencies:
+            return "No input-to-sound samples"
+        delays = sorted(sample[1] for sample in self.latencies)
+        buffer_ms = self.latencies[-1][2]
+        return (f"Input to sound start: {len(delays)} samples, input to play() mean "
+                f"{sum(delays) / len(delays):.2f} ms / max {delays[-1]:.2f} ms, "
+                f"+ {buffer_ms:.1f} ms mixer buffer")
+
+
+def make_tone(frequency=880, duration_ms=60, volume=0.4):
+    """Short sine blip as a Sound, for tests and measurements without sound files"""
+    freq, fmt, channels = pygame.mixer.get_init()
+    count = int(freq * duration_ms / 1000)
+    samples = array.array("h")
+    for i in range(count):
+        value = int(32767 * volume * math.sin(2 * math.pi * frequency * i / freq))
+        samples.extend([value] * channels)
+    return pygame.mixer.Sound(buffer=samples.tobytes())
+
+
+def measure_latency(buffers=(256, 512, 1024, 2048), presses=60, fps=60):
+    """Input-to-sound latency for several mixer buffer sizes, from synthetic clicks.
+
+    Each click is stamped when it is posted, at a random point of a frame,
+    and only picked up by the next frame's event pump, as real input is.
+    """
+    import random
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    for buffer in buffers:
+        pre_init(buffer)
+        pygame.init()
+        pygame.display.set_mode((100, 100))
+        if pygame.mixer.get_init() is None:
+            print("No audio device available")
+            pygame.quit()
+            return
+        bank = SfxBank()
+        bank.add("click", make_tone())
+        rng = random.Random(1)
+        for i in range(presses):
+            arrival = rng.uniform(0, 1 / fps)  # Somewhere in the frame
+            time.sleep(arrival)
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(10, 10),
+                                                 timestamp=time.perf_counter()))
+            time.sleep(1 / fps - arrival)  # Rest of the frame before the next pump
+            for event in pygame.event.get():
+                bank.mark_input(event)
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    bank.play("click")
+        print(f"buffer {buffer:5d}: {bank.latency_report()}, {bank.steals} steals")
+        pygame.quit()
+
+
+# Shared player and effects bank, like assets.cache
+music = MusicPlayer()
+sfx = SfxBank()
+
+
+if __name__ == "__main__":
+    if "--latency" in sys.argv:
+        measure_latency()
@@ -1,82 +1,174 @@
 import pygame
+import os
 import sys
-from pygame.transform import scale, rotate
+import time
+import functools
+import assets
+import display
+
+# Menu background layers, bottom to top: (image path, scroll speed in px/frame (x, y))
+# menu_bg_01.png is not used by the menu, so it is not listed and never decoded
+MENU_LAYERS = [
+    (r"export\data\menu\abmake_bg_01.png", (0, 0)),  # Static backdrop
+    (r"export\data\menu\abmake_bg_02.png", (0, 1)),  # Scrolls down
+]
+
+def layer_request(path, size, opaque=False):
+    """(path, load options) of a layer; the loader picks the fastest blit for its alpha"""
+    return path, dict(size=size, convert="opaque" if opaque else "auto")
+
+def load_layer_image(path, size, opaque=False, retain=True):
+    """Load and scale a layer"""
+    path, options = layer_request(path, size, opaque)
+    return assets.load_image(path, retain=retain, **options)
+
+class ParallaxLayer:
+    """One full-screen background layer that wraps around while scrolling"""
+    def __init__(self, image, speed=(0, 0)):
+        self.image = image
+        self.width, self.height = image.get_size()
+        self.speed_x, self.speed_y = speed
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+
+    @property
+    def moving(self):
+        return self.speed_x != 0 or self.speed_y != 0
+
+    def update(self):
+        self.offset_x = (self.offset_x + self.speed_x) % self.width
+        self.offset_y = (self.offset_y + self.speed_y) % self.height
+
+    def draw(self, screen, blend=0.0):
+        """Blit the layer as up to four wrapped strips covering one screen exactly.
+
+        blend (0..1) draws the layer that far towards its next update() position.
+        """
+        ox = int((self.offset_x + self.speed_x * blend) % self.width)
+        oy = int((self.offset_y + self.speed_y * blend) % self.height)
+        if ox == 0 and oy == 0:
+            screen.blit(self.image, (0, 0))
+            return
+        # (source start, destination start, length) along each axis
+        columns = [(self.width - ox, 0, ox), (0, ox, self.width - ox)]
+        rows = [(self.height - oy, 0, oy), (0, oy, self.height - oy)]
+        for src_x, dst_x, w in columns:
+            if w == 0:
+                continue
+            for src_y, dst_y, h in rows:
+                if h == 0:
+                    continue
+                screen.blit(self.image, (dst_x, dst_y), (src_x, src_y, w, h))
 
 class MenuBackground:
-    def __init__(self, screen_width, screen_height, screen ):
+    def __init__(self, screen_width, screen_height, screen, layers=None):
         """Initialize the background animation system"""
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.screen_size = screen.get_size()
-        # Load and scale images
-        self.background = scale(pygame.image.load(r"export\data\menu\abmake_bg_01.png").convert(), self.screen_size)
-        self.animation = scale(pygame.image.load(r"export\data\menu\abmake_bg_02.png").convert_alpha(), self.screen_size)
-        self.animation2 = scale(pygame.image.load(r"export\data\menu\menu_bg_01.png").convert_alpha(), self.screen_size)
-        
+        # Speeds are in 800x600 pixels, keep the same on-screen pace at other sizes
+        speed_scale = display.ui_scale(screen)
+        # Load and scale only the layers that are actually drawn; the bottom one
+        # is the backdrop and always drawn opaque, like the old convert() did
+        layers = layers if layers is not None else MENU_LAYERS
+        assets.cache.prefetch_many(self.image_requests(self.screen_size, layers))  # Decoded in parallel
+        self.layers = [ParallaxLayer(self._load_image(path, opaque=(i == 0)),
+                                     (speed[0] * speed_scale, speed[1] * speed_scale))
+                       for i, (path, speed) in enumerate(layers)]
+        # Layers below the first moving one never change and can be cached by the caller
+        self.static_count = 0
+        while self.static_count < len(self.layers) and not self.layers[self.static_count].moving:
+            self.static_count += 1
+
         # Animation control
-        self.scroll_offset = 0
-        self.scroll_speed = 1
         self.running = False
-    
-    def _load_image(self, path, convert=False, convert_alpha=False):
-        """Helper method to load and scale images"""
+        self.paused = False  # Layers hold still, e.g. while the title screen sits unattended
+        self.interpolation = 0.0  # Fraction of the next update() to draw ahead
+        self.dirty_rects = []  # Whole screen, the animated layer scrolls every frame
+
+    @staticmethod
+    def image_requests(screen_size, layers=None):
+        """(path, load options) of every layer, for assets.cache.prefetch_many()"""
+        layers = layers if layers is not None else MENU_LAYERS
+        return [layer_request(path, screen_size, i == 0) for i, (path, speed) in enumerate(layers)]
+
+    @staticmethod
+    def preload_jobs(screen_size, layers=None):
+        """Layer reads as one callable that can run on a loader thread"""
+        return [functools.partial(assets.cache.prefetch_many, MenuBackground.image_requests(screen_size, layers))]
+
+    def _load_image(self, path, opaque=False):
+        """Load and scale a layer, falling back to a plain surface"""
         try:
-            img = pygame.image.load(path)
-            if convert:
-                img = img.convert()
-            if convert_alpha:
-                img = img.convert_alpha()
-            return pygame.transform.scale(img, (self.screen_width, self.screen_height))
+            return load_layer_image(path, self.screen_size, opaque)
         except Exception as e:
             print(f"Error loading image {path}: {e}")
             # Create fallback surface
-            surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+            surface = pygame.Surface(self.screen_size).convert()
             surface.fill((50, 50, 100))  # Dark blue fallback
             return surface
-    
+
+    def unload(self):
+        """Release the layer images"""
+        for layer in self.layers:
+            assets.release_image(layer.image)
+        self.layers = []
+        self.static_count = 0
+
+    @property
+    def animating(self):
+        """Whether any layer scrolls, i.e. the background changes every frame"""
+        return not self.paused and any(layer.moving for layer in self.layers)
+
     def update(self):
         """Update animation position"""
-        self.scroll_offset += self.scroll_speed
-        if self.scroll_offset >= self.screen_height:
-            self.scroll_offset = 0
-    
+        if self.paused:
+            return
+        for layer in self.layers:
+            layer.update()
+
     def draw(self, screen):
         """Draw the background elements"""
-        # Static background
-        screen.blit(self.background, (0, 0))
-        
-        # Animated layer (two copies for seamless looping)
-        screen.blit(self.animation, (0, self.scroll_offset - self.screen_height))
-        screen.blit(self.animation, (0, self.scroll_offset))
-        # screen.blit(self.animation2, (0, self.scroll_offset - self.screen_height))
-        # screen.blit(self.animation2, (0, self.scroll_offset))
-    
-def run_test():
-    """Test method to run the animation standalone"""
+        self.draw_static(screen)
+        self.draw_animated(screen)
+
+    def draw_static(self, screen):
+        """Layers below the first scrolling one"""
+        for layer in self.layers[:self.static_count]:
+            layer.draw(screen)
+
+    def draw_animated(self, screen):
+        """Scrolling layers (and everything above them), for callers that cache the static part"""
+        blend = 0.0 if self.paused else self.interpolation
+        for layer in self.layers[self.static_count:]:
+            layer.draw(screen, blend)
+        self.dirty_rects.clear()
+        self.dirty_rects.append(screen.get_rect())
+
+def run_test(layer_counts=(1, 2, 4, 8), frames=300):
+    """Benchmark: frame time of the background for N scrolling layers"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
     pygame.init()
     screen = pygame.display.set_mode((800, 600))
     pygame.display.set_caption("Background Animation Test")
-    clock = pygame.time.Clock()
-    bg = MenuBackground(800, 600, screen)
-    bg.running = True
-    while bg.running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                bg.running = False
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    bg.running = False
-        
-        bg.update()
-        screen.fill((0, 0, 0))  # Clear screen
-        bg.draw(screen)
-        pygame.display.flip()
-        clock.tick(60)
-    
+    static_path, _ = MENU_LAYERS[0]
+    scroll_path, _ = MENU_LAYERS[1]
+    for count in layer_counts:
+        # Static backdrop plus count scrolling layers, each in its own direction/speed
+        speeds = [((i % 3) - 1, 1 + i % 2) for i in range(count)]
+        layers = [(static_path, (0, 0))] + [(scroll_path, speed) for speed in speeds]
+        bg = MenuBackground(800, 600, screen, layers)
+        start = time.perf_counter()
+        for _ in range(frames):
+            bg.update()
+            bg.draw(screen)
+            pygame.display.flip()
+        elapsed = (time.perf_counter() - start) * 1000 / frames
+        print(f"{count} scrolling layer(s): {elapsed:.3f} ms/frame")
     pygame.quit()
     sys.exit()
 
 
 # Example usage:
 if __name__ == "__main__":
-    run_test()
\ No newline at end of file
+    run_test()
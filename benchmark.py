@@ -0,0 +1,443 @@
+"""Headless frame-time benchmarks for every scene.
+
+Runs under SDL's dummy video/audio drivers with a simulated 60 Hz clock, so
+the 13 second intro takes as long as the work it does, not 13 seconds.
+
+    python benchmark.py                          # all scenes, JSON on stdout
+    python benchmark.py --frames 300 intro menu  # selected scenes
+    python benchmark.py --save-baseline bench_baseline.json
+    python benchmark.py --baseline bench_baseline.json  # exit 1 on regression
+    python benchmark.py --startup                # time to first frame, with/without assets.pak
+    python benchmark.py --replay session.yrec    # main loop driven by a recorded session
+    python benchmark.py --simulate               # simulated frames per second, no rendering
+    python benchmark.py --alloc-budget           # exit 1 if a steady frame allocates over ALLOC_BUDGETS
+"""
+import os
+import sys
+import json
+import math
+import time
+import array
+import argparse
+import subprocess
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from clock import FixedStepClock
+
+
+class ScriptedMouse:
+    """Deterministic cursor path with a click every `click_every` frames"""
+    def __init__(self, clock, click_every=12):
+        self.clock = clock
+        self.click_every = click_every
+
+    def _frame(self):
+        return int(self.clock.now / self.clock.frame_ms)
+
+    def get_pos(self):
+        t = self._frame() / 60
+        return (int(400 + 300 * math.cos(t)), int(300 + 200 * math.sin(2 * t)))
+
+    def get_pressed(self):
+        pressed = self._frame() % self.click_every < 2
+        return (pressed, False, False)
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, None where it cannot be read"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    except ImportError:
+        return None
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(frame_times, alloc_bytes, retained_bytes=None):
+    ms = sorted(t * 1000 for t in frame_times)
+    return {
+        "frames": len(ms),
+        "mean_ms": sum(ms) / len(ms) if ms else 0.0,
+        "p50_ms": percentile(ms, 50),
+        "p95_ms": percentile(ms, 95),
+        "p99_ms": percentile(ms, 99),
+        "alloc_bytes_per_frame": sum(alloc_bytes) / len(alloc_bytes) if alloc_bytes else 0.0,
+        "alloc_max_bytes": max(alloc_bytes) if alloc_bytes else 0,
+        "alloc_retained_bytes": retained_bytes,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+
+
+def measure(step, frames, clock):
+    """Time `frames` calls of step(), then measure Python allocations in a second pass.
+
+    tracemalloc slows everything down, so it is kept out of the timed pass,
+    which doubles as the warmup: the allocation pass sees steady-state
+    frames. Allocation numbers are the peak transient Python bytes per frame
+    (mean and worst) and what the pass kept allocated at its end, which is
+    what a leak per frame would show up in; pixel buffers allocated inside
+    SDL are not visible to tracemalloc.
+    """
+    frame_times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        step()
+        frame_times.append(time.perf_counter() - start)
+        clock.now += clock.frame_ms
+    alloc_bytes = array.array("q", bytes(8 * min(frames, 120)))  # Filled in place, so not counted as retained
+    tracemalloc.start()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    for i in range(len(alloc_bytes)):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        step()
+        alloc_bytes[i] = tracemalloc.get_traced_memory()[1] - before
+        clock.now += clock.frame_ms
+    retained = tracemalloc.get_traced_memory()[0] - start_bytes
+    tracemalloc.stop()
+    return summarize(frame_times, alloc_bytes, retained)
+
+
+def bench_intro(screen, frames):
+    from intro import Intro
+    clock = FixedStepClock()
+    intro = Intro(screen, 800, 600, clock)
+    def step():
+        screen.fill((0, 0, 0))
+        intro.update()
+    return measure(step, frames, clock)
+
+
+def bench_menu(screen, frames):
+    from menu import Menu
+    clock = FixedStepClock()
+    menu = Menu(screen)
+    try:
+        return measure(menu.update, frames, clock)
+    finally:
+        menu.cleanup()
+
+
+def bench_background(screen, frames):
+    from background import MenuBackground
+    clock = FixedStepClock()
+    bg = MenuBackground(800, 600, screen)
+    def step():
+        bg.update()
+        bg.draw(screen)
+    return measure(step, frames, clock)
+
+
+def bench_mouse(screen, frames):
+    from mouse import Mouse
+    clock = FixedStepClock()
+    mouse = Mouse(screen, clock)
+    script = ScriptedMouse(clock)
+    mouse.get_pos = script.get_pos
+    mouse.get_pressed = script.get_pressed
+    def step():
+        screen.fill((0, 0, 0))
+        mouse.update()
+    return measure(step, frames, clock)
+
+
+class TracingClock(FixedStepClock):
+    """FixedStepClock that also records each frame's peak Python allocations.
+
+    Tracing starts at tick number trace_from, so the frames before it
+    (loading, the intro) run at full speed and act as the warmup.
+    """
+
+    def __init__(self, trace_from=0, frame_ms=1000 / 60):
+        super().__init__(frame_ms)
+        self.trace_from = trace_from
+        self.ticks = 0
+        self.alloc_bytes = []
+        self.start_bytes = None
+        self._before = 0
+
+    def tick(self, framerate=0):
+        if self.ticks > self.trace_from:
+            self.alloc_bytes.append(tracemalloc.get_traced_memory()[1] - self._before)
+        elapsed = super().tick(framerate)  # Its own bookkeeping is not the frame's
+        if self.ticks == self.trace_from:
+            tracemalloc.start()
+            self.start_bytes = tracemalloc.get_traced_memory()[0]
+        if self.ticks >= self.trace_from:
+            tracemalloc.reset_peak()
+            self._before = tracemalloc.get_traced_memory()[0]
+        self.ticks += 1
+        return elapsed
+
+
+# Frames main() needs to play the 13 s intro and hand over to the menu
+INTRO_FRAMES = 800
+
+
+def bench_main(screen, frames):
+    """Full main.main() state machine through the intro into `frames` menu frames.
+
+    Frame times come from a run without tracemalloc; a second run traces
+    the last min(frames, 120) menu frames for the allocation figures. Both
+    runs start from cold caches.
+    """
+    import main
+    total = INTRO_FRAMES + frames
+    clock = FixedStepClock()
+    main.main(clock=clock, frames=total, idle=False)  # Idle waits would block in real time
+    traced = min(frames, 120)
+    tracing = TracingClock(trace_from=total - traced - 1)
+    cold_start()
+    main.main(clock=tracing, frames=total, idle=False)
+    retained = tracemalloc.get_traced_memory()[0] - tracing.start_bytes
+    tracemalloc.stop()
+    return summarize(clock.frame_times[1:], tracing.alloc_bytes, retained)
+
+
+def bench_replay(path):
+    """Full main.main() fed by a recording from `python main.py --record FILE`"""
+    import main
+    from replay import InputPlayer
+    player = InputPlayer(path)
+    main.main(clock=player, frames=player.frame_count, idle=False, inputs=player)
+    return summarize(player.frame_times[1:], [])
+
+
+SCENES = {
+    "intro": bench_intro,
+    "menu": bench_menu,
+    "background": bench_background,
+    "mouse": bench_mouse,
+    "main": bench_main,
+}
+
+# Steady-state allocation budgets in bytes: the worst frame's peak transient
+# Python allocations, and what a 120 frame pass may keep allocated (a leak
+# of a few bytes per frame). Measured figures are a fraction of these; a
+# scene that goes over has started creating objects every frame again.
+ALLOC_BUDGETS = {
+    "intro": {"alloc_max_bytes": 1024, "alloc_retained_bytes": 2048},
+    "menu": {"alloc_max_bytes": 2048, "alloc_retained_bytes": 2048},
+    "background": {"alloc_max_bytes": 2048, "alloc_retained_bytes": 2048},
+    "mouse": {"alloc_max_bytes": 4096, "alloc_retained_bytes": 2048},
+    "main": {"alloc_max_bytes": 4096},  # Retained bytes include main()'s shutdown and the clock's lists
+}
+
+
+def bench_simulation(seconds=60):
+    """Simulated frames per second when only the scene logic runs (no drawing).
+
+    The intro runs its whole 13 s sequence, the menu background scrolls and
+    the cursor ripples for `seconds` of simulated time, all on a fixed-step clock.
+    """
+    from intro import Intro, IntroState
+    from menu import Menu
+    from mouse import Mouse
+    screen = pygame.display.get_surface()
+    results = {}
+
+    def record(name, frames, clock, wall):
+        results[name] = {
+            "frames": frames,
+            "simulated_s": (clock.now - 1.0) / 1000,
+            "wall_ms": wall * 1000,
+            "frames_per_second": frames / wall if wall else None,
+        }
+
+    clock = FixedStepClock()
+    intro = Intro(screen, 800, 600, clock)
+    frames = 0
+    start = time.perf_counter()
+    while intro.current_state != IntroState.END:
+        intro.step()
+        clock.tick()
+        frames += 1
+    record("intro", frames, clock, time.perf_counter() - start)
+
+    clock = FixedStepClock()
+    menu = Menu(screen)
+    frames = int(seconds * 1000 / clock.frame_ms)
+    start = time.perf_counter()
+    for _ in range(frames):
+        menu.step()
+        clock.tick()
+    record("menu", frames, clock, time.perf_counter() - start)
+    menu.cleanup()
+
+    clock = FixedStepClock()
+    mouse = Mouse(screen, clock)
+    script = ScriptedMouse(clock)
+    start = time.perf_counter()
+    mouse.get_pos = script.get_pos
+    mouse.get_pressed = script.get_pressed
+    for _ in range(frames):
+        mouse.step()
+        clock.tick()
+    record("mouse", frames, clock, time.perf_counter() - start)
+    return results
+
+
+def cold_start():
+    """Drop what a previous scene or main() run left in the shared caches and audio singletons"""
+    import assets
+    import audio
+    assets.cache.clear()
+    assets.release_sounds()
+    audio.music = audio.MusicPlayer()
+    audio.sfx = audio.SfxBank()
+
+
+def run(scenes, frames):
+    results = {}
+    for name in scenes:
+        cold_start()
+        pygame.init()
+        screen = pygame.display.set_mode((800, 600))
+        results[name] = SCENES[name](screen, frames)
+        pygame.quit()
+    return results
+
+
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+import benchmark, main
+ready = time.perf_counter()
+main.main(clock=benchmark.FixedStepClock(), frames=1, archive={archive})
+end = time.perf_counter()
+print(end - start, end - ready)
+"""
+
+
+def bench_startup(runs=5):
+    """Time to first frame in fresh processes, with and without the asset archive.
+
+    process_ms counts from interpreter start (imports included), main_ms from
+    the main() call, which is the part the archive can speed up.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for archive in (False, True):
+        process_ms = []
+        main_ms = []
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT.format(archive=archive)],
+                                    cwd=here, capture_output=True, text=True, check=True).stdout
+            total, in_main = output.strip().splitlines()[-1].split()
+            process_ms.append(float(total) * 1000)
+            main_ms.append(float(in_main) * 1000)
+        process_ms.sort()
+        main_ms.sort()
+        results["archive" if archive else "png"] = {
+            "runs": runs,
+            "process_p50_ms": percentile(process_ms, 50),
+            "main_p50_ms": percentile(main_ms, 50),
+            "main_min_ms": main_ms[0],
+        }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of regressions against a stored baseline"""
+    regressions = []
+    for scene, stats in results.items():
+        base = baseline.get(scene)
+        if base is None:
+            continue
+        for key in ("mean_ms", "p95_ms", "p99_ms"):
+            if base.get(key) and stats[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{scene}.{key}: {stats[key]:.3f} ms vs baseline {base[key]:.3f} ms "
+                                   f"(+{(stats[key] / base[key] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def check_alloc_budgets(results, budgets=ALLOC_BUDGETS):
+    """Return a list of scenes whose steady-state frames allocate over budget"""
+    violations = []
+    for scene, stats in results.items():
+        for key, limit in budgets.get(scene, {}).items():
+            if stats.get(key) is not None and stats[key] > limit:
+                violations.append(f"{scene}.{key}: {stats[key]} bytes vs budget {limit} bytes")
+    return violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless scene frame-time benchmarks")
+    parser.add_argument("scenes", nargs="*", default=list(SCENES), help="scenes to run (default: all)")
+    parser.add_argument("--frames", type=int, default=600, help="frames per scene (default: 600)")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--baseline", help="compare against this JSON report and fail on regressions")
+    parser.add_argument("--save-baseline", help="write the JSON report as a new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (default: 0.25)")
+    parser.add_argument("--startup", action="store_true", help="measure time to first frame instead")
+    parser.add_argument("--replay", help="run main() on this input recording instead")
+    parser.add_argument("--simulate", action="store_true", help="measure simulated frames per second instead")
+    parser.add_argument("--alloc-budget", action="store_true",
+                        help="fail if a scene's steady-state frames allocate more than ALLOC_BUDGETS")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        print(json.dumps(bench_startup(), indent=2))
+        return 0
+    if args.replay:
+        print(json.dumps({"replay": bench_replay(args.replay)}, indent=2))
+        return 0
+    if args.simulate:
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        print(json.dumps(bench_simulation(), indent=2))
+        pygame.quit()
+        return 0
+
+    unknown = [name for name in args.scenes if name not in SCENES]
+    if unknown:
+        parser.error(f"unknown scene(s): {', '.join(unknown)}")
+    if args.alloc_budget:
+        args.scenes = [name for name in args.scenes if name in ALLOC_BUDGETS]
+
+    results = run(args.scenes, args.frames)
+    report = json.dumps(results, indent=2)
+    print(report)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                f.write(report)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("PERFORMANCE REGRESSION:", file=sys.stderr)
+            for line in regressions:
+                print("  " + line, file=sys.stderr)
+            return 1
+    if args.alloc_budget:
+        violations = check_alloc_budgets(results)
+        if violations:
+            print("ALLOCATION BUDGET EXCEEDED:", file=sys.stderr)
+            for line in violations:
+                print("  " + line, file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Offline build step: pack every image the game loads into export/assets.pak.
+
+Loads each scene headlessly so the shared asset cache holds exactly the
+decoded and scaled surfaces the game asks for, then writes them out raw.
+Re-run after changing any PNG (stale entries are ignored at runtime anyway).
+
+    python build_assets.py [output path]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import assets
+
+
+def build(path=assets.ARCHIVE_PATH):
+    from intro import Intro
+    from menu import Menu
+    from mouse import Mouse
+
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    start = time.perf_counter()
+    # Constructing the scenes fills the cache with every (path, transform) they use
+    Mouse(screen)
+    Intro(screen, 800, 600)
+    Menu(screen).cleanup()
+    count, size = assets.AssetArchive.write(path, assets.cache)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {count} images ({size / 1024 / 1024:.1f} MiB) to {path} in {elapsed:.2f} s")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    build(*sys.argv[1:2])
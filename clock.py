@@ -0,0 +1,59 @@
+import time
+import pygame
+
+
+class RealClock:
+    """Wall time, as the game runs normally: pygame's ticks and frame limiter"""
+
+    def __init__(self):
+        self._clock = pygame.time.Clock()
+
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+    def tick(self, framerate=0):
+        return self._clock.tick(framerate)
+
+
+class FixedStepClock:
+    """Every tick() advances time by frame_ms without sleeping.
+
+    Scenes driven by it run as fast as their own work allows, e.g. the 13
+    second intro in a fraction of a second. frame_times collects the wall
+    time between ticks, i.e. the work done per frame.
+    """
+
+    def __init__(self, frame_ms=1000 / 60):
+        self.frame_ms = frame_ms
+        self.now = 1.0  # Scenes treat a start time of 0 as "not started yet"
+        self.frame_times = []
+        self._last = time.perf_counter()
+
+    def get_ticks(self):
+        return int(self.now)
+
+    def tick(self, framerate=0):
+        now = time.perf_counter()
+        self.frame_times.append(now - self._last)
+        self._last = now
+        self.now += self.frame_ms
+        return self.frame_ms
+
+
+class ManualClock:
+    """Time only moves when advance() is called; tick() reports how far it moved"""
+
+    def __init__(self, start_ms=1.0):
+        self.now = float(start_ms)
+        self._last_tick = self.now
+
+    def get_ticks(self):
+        return int(self.now)
+
+    def advance(self, ms):
+        self.now += ms
+
+    def tick(self, framerate=0):
+        elapsed = self.now - self._last_tick
+        self._last_tick = self.now
+        return elapsed
@@ -0,0 +1,80 @@
+import os
+import argparse
+import pygame
+import assets
+
+# Every scene is laid out for this size
+LOGICAL_SIZE = (800, 600)
+SCALED_CACHE_DIR = os.path.join("cache", "scaled")
+
+
+def parse_resolution(text):
+    width, height = text.lower().split("x")
+    return (int(width), int(height))
+
+
+class DisplaySettings:
+    """Window options passed by the launcher (--resolution, --fullscreen, --language, --vsync).
+
+    Two ways to present at a resolution other than 800x600:
+      "scaled" -- render the logical 800x600 and let SDL's SCALED renderer
+                  stretch it on the GPU (cheap, softer when enlarged)
+      "native" -- open the window at the real resolution and load every asset
+                  scaled to it; each (asset, resolution) is smoothscaled once
+                  and kept in cache/scaled/ for later launches
+    "auto" uses native assets when enlarging and SCALED otherwise.
+
+    vsync needs an SDL renderer, so it always presents through SCALED (at a
+    factor of 1 when the window is opened at its real size).
+    """
+
+    def __init__(self, resolution=LOGICAL_SIZE, fullscreen=False, language="english", render="auto",
+                 vsync=False):
+        self.resolution = tuple(resolution)
+        self.fullscreen = fullscreen
+        self.language = language
+        self.render = render
+        self.vsync = vsync
+
+    @classmethod
+    def from_argv(cls, argv):
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument("--resolution", type=parse_resolution, default=LOGICAL_SIZE)
+        parser.add_argument("--fullscreen", action="store_true")
+        parser.add_argument("--language", default="english")
+        parser.add_argument("--render", choices=("auto", "scaled", "native"), default="auto")
+        parser.add_argument("--vsync", action="store_true")
+        args, _ = parser.parse_known_args(argv)
+        return cls(args.resolution, args.fullscreen, args.language, args.render, args.vsync)
+
+    @property
+    def native(self):
+        """Whether scenes render at the real resolution with rescaled assets"""
+        if self.resolution == LOGICAL_SIZE:
+            return False
+        if self.render == "auto":
+            return self.resolution[0] > LOGICAL_SIZE[0] or self.resolution[1] > LOGICAL_SIZE[1]
+        return self.render == "native"
+
+    def create_screen(self):
+        flags = pygame.FULLSCREEN if self.fullscreen else 0
+        size = self.resolution if self.native else LOGICAL_SIZE
+        if self.native:
+            # Assets are scaled per resolution; keep the results on disk
+            assets.cache.disk_cache = assets.ScaledDiskCache(SCALED_CACHE_DIR)
+        if size == self.resolution and not self.vsync:
+            return pygame.display.set_mode(size, flags)
+        screen = pygame.display.set_mode(size, flags | pygame.SCALED, vsync=int(self.vsync))
+        if not self.fullscreen:
+            try:
+                # SCALED picks its own window size; the renderer letterboxes to any size
+                from pygame._sdl2.video import Window
+                Window.from_display_module().size = self.resolution
+            except Exception as e:
+                print(f"Could not resize the window to {self.resolution}: {e}")
+        return screen
+
+
+def ui_scale(screen):
+    """Factor between the screen and the logical 800x600 layout"""
+    return screen.get_width() / LOGICAL_SIZE[0]
@@ -0,0 +1,188 @@
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pygame
+
+
+class EffectPool:
+    """Ripple-style effects kept in preallocated NumPy arrays.
+
+    Every effect plays the same RippleAtlas curve, so all that is stored per
+    effect is its centre and start time; the frame (scale and alpha baked
+    into the atlas) follows from the elapsed time for all effects at once.
+    Effects are spawned in time order and share one duration, so the live
+    ones are always a contiguous run [head, tail) ordered by start time and
+    expiring them is a single searchsorted, never a list removal. Draws go
+    through Surface.blits(), one call per BLIT_BATCH effects.
+
+    Per frame only the Python tuples handed to blits() are allocated, at
+    most one batch at a time; the arrays and scratch buffers are sized once
+    for `capacity` effects. When the pool is full the oldest effect makes
+    room for the new one.
+    """
+
+    BLIT_BATCH = 512
+
+    def __init__(self, atlas, capacity=4096):
+        self.atlas = atlas
+        self.capacity = capacity
+        self.duration = atlas.animation_duration
+        self.x = np.zeros(capacity, np.int32)
+        self.y = np.zeros(capacity, np.int32)
+        self.start = np.zeros(capacity, np.float64)
+        self.frame = np.zeros(capacity, np.int32)  # Atlas frame per effect, from update()
+        self.head = 0
+        self.tail = 0
+        # Atlas frame sizes, indexed by frame
+        self.half_w = np.array([offset[0] for offset in atlas.offsets], np.int32)
+        self.half_h = np.array([offset[1] for offset in atlas.offsets], np.int32)
+        self.frame_w = np.array([frame.get_width() for frame in atlas.frames], np.int32)
+        self.frame_h = np.array([frame.get_height() for frame in atlas.frames], np.int32)
+        # Scratch buffers reused every frame
+        self._progress = np.zeros(capacity, np.float64)
+        self._left = np.zeros(capacity, np.int32)
+        self._top = np.zeros(capacity, np.int32)
+        self._edge = np.zeros(capacity, np.int32)
+        self._size = np.zeros(capacity, np.int32)  # Per-effect lookups, gathered with np.take(out=)
+        self.dropped = 0
+
+    @property
+    def count(self):
+        return self.tail - self.head
+
+    def spawn(self, x, y, now):
+        """Start an effect centred on (x, y) at time now (ms, never earlier than the last spawn)"""
+        if self.count and now < self.start[self.tail - 1]:
+            now = self.start[self.tail - 1]  # Keep start times sorted
+        if self.count == self.capacity:
+            self.head += 1  # Full: the oldest effect makes room
+            self.dropped += 1
+        if self.tail == self.capacity:
+            # Move the live run back to the front; happens once per `capacity` spawns
+            n = self.count
+            for array in (self.x, self.y, self.start):
+                array[:n] = array[self.head:self.tail].copy()
+            self.head, self.tail = 0, n
+        self.x[self.tail] = x
+        self.y[self.tail] = y
+        self.start[self.tail] = now
+        self.tail += 1
+
+    def clear(self):
+        self.head = self.tail = 0
+
+    def update(self, now):
+        """Expire finished effects and pick every live effect's atlas frame"""
+        live = self.start[self.head:self.tail]
+        # Finished once now - start >= duration, and starts are sorted
+        self.head += int(np.searchsorted(live, now - self.duration, side="right"))
+        if self.head == self.tail:
+            self.head = self.tail = 0
+            return False
+        n = self.count
+        progress = self._progress[:n]
+        np.subtract(now, self.start[self.head:self.tail], out=progress)
+        np.divide(progress, self.duration, out=progress)  # Same curve as ClickAnimation's tweens
+        np.multiply(progress, self.atlas.frame_steps, out=progress)
+        frame = self.frame[:n]
+        np.copyto(frame, progress, casting="unsafe")  # Truncates like int()
+        np.clip(frame, 0, self.atlas.frame_steps - 1, out=frame)
+        return True
+
+    def draw(self, surface):
+        """Blit all live effects in one call; returns the rect they cover, or None"""
+        n = self.count
+        if n == 0:
+            return None
+        frame = self.frame[:n]
+        left = self._left[:n]
+        top = self._top[:n]
+        size = self._size[:n]
+        np.subtract(self.x[self.head:self.tail], np.take(self.half_w, frame, out=size), out=left)
+        np.subtract(self.y[self.head:self.tail], np.take(self.half_h, frame, out=size), out=top)
+        frames = self.atlas.frames
+        for i in range(0, n, self.BLIT_BATCH):
+            j = i + self.BLIT_BATCH
+            surface.blits(zip(map(frames.__getitem__, frame[i:j].tolist()),
+                              zip(left[i:j].tolist(), top[i:j].tolist())), doreturn=False)
+        edge = self._edge[:n]
+        np.add(left, np.take(self.frame_w, frame, out=size), out=edge)
+        right = int(edge.max())
+        np.add(top, np.take(self.frame_h, frame, out=size), out=edge)
+        bottom = int(edge.max())
+        x, y = int(left.min()), int(top.min())
+        return pygame.Rect(x, y, right - x, bottom - y).clip(surface.get_rect())
+
+
+def _run_ripples(screen, atlas, use_pool, count, frames, trace):
+    """Keep `count` ripples alive for `frames` frames; returns (ms per frame, Python bytes per frame)"""
+    from mouse import ClickAnimation
+    from tween import TweenEngine
+    frame_ms = 1000 / 60
+    now = [1.0]
+    get_ticks = lambda: now[0]
+    pool = EffectPool(atlas, capacity=count)
+    anims = []
+    tweens = TweenEngine()  # All ClickAnimations' tweens, evaluated in one batch
+    per_frame = count * frame_ms / atlas.animation_duration
+    budget = 0.0
+    elapsed = 0.0
+    allocated = 0
+    if trace:
+        tracemalloc.start()
+    for i in range(frames + 60):
+        if trace:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        budget += per_frame
+        while budget >= 1:
+            budget -= 1
+            x, y = (i * 37 + int(budget * 53)) % 800, (i * 53 + int(budget * 37)) % 600
+            if use_pool:
+                pool.spawn(x, y, now[0])
+            else:
+                anims.append(ClickAnimation(x, y, atlas, get_ticks, tweens))
+        if use_pool:
+            pool.update(now[0])
+            pool.draw(screen)
+        else:
+            tweens.update(now[0])
+            for anim in anims[:]:  # The old Mouse.update loop
+                if anim.update():
+                    anim.draw(screen)
+                else:
+                    anims.remove(anim)
+        if i >= 60:  # The first second fills the screen up to `count` ripples
+            elapsed += time.perf_counter() - start
+            if trace:
+                allocated += tracemalloc.get_traced_memory()[1] - before
+        now[0] += frame_ms
+    if trace:
+        tracemalloc.stop()
+    return elapsed * 1000 / frames, allocated / frames
+
+
+def bench_effects(counts=(10, 100, 1000, 5000), frames=120):
+    """Per-frame cost of N live ripples: ClickAnimation objects vs the pool"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import assets
+    from mouse import RippleAtlas, CLICK_IMAGE
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    atlas = RippleAtlas(assets.load_image(CLICK_IMAGE))
+    for count in counts:
+        objects_ms, _ = _run_ripples(screen, atlas, False, count, frames, False)
+        pool_ms, _ = _run_ripples(screen, atlas, True, count, frames, False)
+        _, objects_bytes = _run_ripples(screen, atlas, False, count, frames, True)
+        _, pool_bytes = _run_ripples(screen, atlas, True, count, frames, True)
+        print(f"{count:5d} ripples: objects {objects_ms:7.3f} ms, pool {pool_ms:7.3f} ms "
+              f"({objects_ms / pool_ms:.1f}x), Python bytes/frame {objects_bytes:.0f} vs {pool_bytes:.0f}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        bench_effects()
@@ -1,7 +1,14 @@
 import pygame
 import sys
+import os
+import time
+import tracemalloc
+import assets
+from clock import ManualClock
+from scenes import Scene
+from tween import TweenEngine, Sequence, Tween, Wait, Call
 
-# State machine
+# Timeline stages, set by Intro.timeline()'s calls
 class IntroState:
     START = 0
     FADE_IN = 1
@@ -10,8 +17,9 @@ class IntroState:
     PAUSE = 4
     END = 5
 
-class Intro:
-    def __init__(self, screen, width, height):
+class Intro(Scene):
+    def __init__(self, screen, width, height, clock=None):
+        """clock supplies get_ticks() (default: pygame's wall time)"""
         self.screen = screen
         # Animation settings (all times in milliseconds)
         self.ANIMATION_TIMINGS = {
@@ -21,65 +29,150 @@ class Intro:
             "fade_out": 1500,  # 1.5 seconds
             "pause": 5000      # 5 seconds black screen
         }
-        self.original_logo = pygame.image.load(r"export\data\logo\konami_logo_0_j.png").convert_alpha()
-        self.logo = pygame.transform.scale(self.original_logo, (width, height))  # Force fullscreen stretch
+        self.logo = assets.load_image(r"export\data\logo\konami_logo_0_j.png", size=(width, height))  # Force fullscreen stretch
+        # "surface_alpha" fades one reusable opaque logo with per-surface alpha,
+        # "multiply" is the old copy + BLEND_RGBA_MULT path (2 MB per frame)
+        self.fade_mode = "surface_alpha"
+        # The intro is always drawn over black, so bake the logo onto black once
+        self.logo_opaque = pygame.Surface(self.logo.get_size()).convert()
+        self.logo_opaque.fill((0, 0, 0))
+        self.logo_opaque.blit(self.logo, (0, 0))
+        self.logo_alpha = -1  # Surface alpha currently set on logo_opaque
+        self.surface_bytes_allocated = 0  # Bytes of temporary surfaces created by draw()
+        self.get_ticks = clock.get_ticks if clock is not None else pygame.time.get_ticks
+        # Dirty-rect rendering (see render.DirtyRenderer)
+        self.skip_unchanged = False
+        self.dirty_rects = []
+        self.drawn_alpha = None  # Alpha on screen after the last draw, None = unknown
         self.current_state = IntroState.START
-        self.state_start_time = 0
         self.alpha = 0  # Current opacity (0-255)
+        self.tweens = TweenEngine()
+        self.playback = None
         
+    def unload(self):
+        """Release the logo images"""
+        self.tweens.clear()  # Its calls refer back to the intro
+        self.playback = None
+        assets.release_image(self.logo)
+        self.logo = self.logo_opaque = self.logo_copy = None
+
+    def invalidate(self):
+        self.drawn_alpha = None
+
+    @property
+    def animating(self):
+        """Whether the screen changes from one frame to the next right now"""
+        return self.current_state in (IntroState.FADE_IN, IntroState.FADE_OUT)
+
     def draw(self):
-        if self.current_state != IntroState.PAUSE:
+        if self.skip_unchanged:
+            # The main loop no longer clears the screen every frame
+            self.screen.fill((0, 0, 0))
+        if self.current_state == IntroState.PAUSE:
+            return
+        if self.fade_mode == "multiply":
             # Apply current alpha to logo
             self.logo_copy = self.logo.copy()
             self.logo_copy.fill((255, 255, 255, self.alpha), special_flags=pygame.BLEND_RGBA_MULT)
+            self.surface_bytes_allocated += self.logo_copy.get_pitch() * self.logo_copy.get_height()
             self.screen.blit(self.logo_copy, (0, 0))
+            return
+        if self.alpha == 0:
+            return  # Fully transparent, the black background is already there
+        # Same result as the old multiply path: only the alpha was scaled
+        if self.alpha != self.logo_alpha:
+            self.logo_opaque.set_alpha(self.alpha if self.alpha < 255 else None)
+            self.logo_alpha = self.alpha
+        self.screen.blit(self.logo_opaque, (0, 0))
     
     def update(self):
-        self.current_time = pygame.time.get_ticks()
-        
-        # State management
-        if self.current_state == IntroState.START:
-            if self.state_start_time == 0:
-                self.state_start_time = self.current_time
-            
-            progress = min(1.0, (self.current_time - self.state_start_time) / self.ANIMATION_TIMINGS["start"])
-            
-            if progress >= 1.0:
-                self.current_state = IntroState.FADE_IN
-                self.state_start_time = self.current_time
-        if self.current_state == IntroState.FADE_IN:
-            if self.state_start_time == 0:
-                self.state_start_time = self.current_time
-            
-            progress = min(1.0, (self.current_time - self.state_start_time) / self.ANIMATION_TIMINGS["fade_in"])
-            self.alpha = int(255 * progress)
-            
-            if progress >= 1.0:
-                self.current_state = IntroState.HOLD
-                self.state_start_time = self.current_time
-        
-        elif self.current_state == IntroState.HOLD:
-            self.alpha = 255
-            if self.current_time - self.state_start_time >= self.ANIMATION_TIMINGS["hold"]:
-                self.current_state = IntroState.FADE_OUT
-                self.state_start_time = self.current_time
-        
-        elif self.current_state == IntroState.FADE_OUT:
-            progress = min(1.0, (self.current_time - self.state_start_time) / self.ANIMATION_TIMINGS["fade_out"])
-            self.alpha = int(255 * (1 - progress))
-            
-            if progress >= 1.0:
-                self.current_state = IntroState.PAUSE
-                self.state_start_time = self.current_time
-        
-        elif self.current_state == IntroState.PAUSE:
-            self.alpha = 0
-            if self.current_time - self.state_start_time >= self.ANIMATION_TIMINGS["pause"]:
-                self.current_state = IntroState.END # This will end it
-                self.state_start_time = 0  # Reset for new cycle
-        
-        # Drawing
+        self.step()
+        self.render()
+
+    def step(self):
+        """Advance the timeline to the current time (one fixed step in main.py)"""
+        now = self.get_ticks()
+        if self.playback is None:
+            self.playback = self.tweens.play(self.timeline(), now)  # Starts on the first step
+        self.tweens.update(now)
+
+    def timeline(self):
+        """START, FADE_IN, HOLD, FADE_OUT, PAUSE, END as one tween timeline"""
+        timings = self.ANIMATION_TIMINGS
+        return Sequence(
+            Wait(timings["start"]),
+            Call(lambda: self._enter(IntroState.FADE_IN)),
+            Tween(timings["fade_in"], 0, 255, apply=self._set_alpha),
+            Call(lambda: self._enter(IntroState.HOLD)),
+            Wait(timings["hold"]),
+            Call(lambda: self._enter(IntroState.FADE_OUT)),
+            Tween(timings["fade_out"], 255, 0, apply=self._set_alpha),
+            Call(lambda: self._enter(IntroState.PAUSE)),
+            Wait(timings["pause"]),
+            Call(lambda: self._enter(IntroState.END)),  # This will end it
+        )
+
+    def _enter(self, state):
+        self.current_state = state
+
+    def _set_alpha(self, value):
+        self.alpha = int(value)
+
+    def render(self, blend=0.0):
+        """Draw the current fade level, unless it is already on screen"""
+        self.dirty_rects.clear()
+        shown_alpha = 0 if self.current_state == IntroState.PAUSE else self.alpha
+        if self.skip_unchanged and shown_alpha == self.drawn_alpha:
+            return  # Nothing changed since the last frame
+        self.drawn_alpha = shown_alpha
         self.draw()
+        self.dirty_rects.append(self.screen.get_rect())
+
+def bench_intro(frame_ms=1000 / 60):
+    """Run the whole intro timeline on a simulated clock for both fade modes"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    screens = {}
+    for mode in ("multiply", "surface_alpha"):
+        clock = ManualClock()
+        intro = Intro(screen, 800, 600, clock)
+        intro.fade_mode = mode
+        frame_times = []
+        python_bytes = 0
+        frames = 0
+        samples = {}
+        tracemalloc.start()
+        while intro.current_state != IntroState.END:
+            screen.fill((0, 0, 0))
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            intro.update()
+            frame_times.append(time.perf_counter() - start)
+            python_bytes += tracemalloc.get_traced_memory()[1] - before
+            if intro.current_state in (IntroState.FADE_IN, IntroState.FADE_OUT):
+                samples.setdefault(intro.alpha, screen.get_at((400, 300)))
+            clock.advance(frame_ms)
+            frames += 1
+        tracemalloc.stop()
+        screens[mode] = samples
+        frame_times.sort()
+        print(f"{mode:>13}: {frames} frames, mean {sum(frame_times) * 1000 / frames:.3f} ms, "
+              f"p95 {frame_times[int(frames * 0.95)] * 1000:.3f} ms, "
+              f"surfaces {intro.surface_bytes_allocated / frames / 1024:.0f} KiB/frame, "
+              f"python {python_bytes / frames:.0f} B/frame")
+    # Both paths must agree within one alpha step at every alpha value seen
+    worst = 0
+    for alpha, old in screens["multiply"].items():
+        new = screens["surface_alpha"].get(alpha)
+        if new is not None:
+            worst = max(worst, max(abs(a - b) for a, b in zip(old[:3], new[:3])))
+    print(f"max channel difference between modes: {worst}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    bench_intro()
 """
 # Initialize Pygame
 pygame.init()
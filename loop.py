@@ -0,0 +1,194 @@
+import gc
+import os
+import sys
+import time
+import pygame
+
+# Events that count as user activity and wake the loop from idle mode
+INPUT_EVENTS = {pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+                pygame.MOUSEWHEEL, pygame.KEYDOWN, pygame.KEYUP}
+
+
+class FixedStepLoop:
+    """Fixed simulation step decoupled from the render rate.
+
+    Real elapsed time is fed in each frame and spent in whole steps of
+    step_ms, so scenes animate at the same speed whether the screen runs at
+    30, 60 or 144 Hz. What is left over becomes `alpha` (0..1), the fraction
+    of the next step already elapsed, which scenes can use to interpolate
+    what they draw. get_ticks() is simulation time for scene timers;
+    render_ticks() adds the interpolated part for things drawn every frame.
+
+    Idle mode: when nothing on screen is animating and there has been no
+    input for idle_after_ms, wait() blocks on the event queue and the loop
+    only redraws idle_fps times per second. Any input wakes it at once.
+    """
+
+    def __init__(self, step_ms=1000 / 60, start_ms=0, fps=60, vsync=False, idle=True,
+                 idle_fps=10, idle_after_ms=5000, max_frame_ms=250):
+        self.step_ms = step_ms
+        self.sim_ms = float(start_ms)
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.fps = fps
+        self.vsync = vsync
+        self.idle_enabled = idle
+        self.idle_fps = idle_fps
+        self.idle_after_ms = idle_after_ms
+        self.max_frame_ms = max_frame_ms  # A longer hitch is dropped, not simulated
+        self.quiet_ms = 0.0  # Time since the last input event
+        self.idle = False
+        self.step_count = 0
+        self.idle_frames = 0
+
+    def get_ticks(self):
+        return int(self.sim_ms)
+
+    def render_ticks(self):
+        return int(self.sim_ms + self.alpha * self.step_ms)
+
+    def steps(self, elapsed_ms):
+        """Advance simulation time; yields once per fixed step to run"""
+        self.accumulator += min(elapsed_ms, self.max_frame_ms)
+        while self.accumulator >= self.step_ms:
+            self.accumulator -= self.step_ms
+            self.sim_ms += self.step_ms
+            self.step_count += 1
+            yield
+        self.alpha = self.accumulator / self.step_ms
+
+    def note_event(self, event):
+        if event.type in INPUT_EVENTS:
+            self.quiet_ms = 0.0
+
+    def wait(self, clock, animating):
+        """End the frame: cap the frame rate, or block while idle; returns elapsed ms"""
+        self.idle = self.idle_enabled and not animating and self.quiet_ms >= self.idle_after_ms
+        if self.idle:
+            self.idle_frames += 1
+            event = pygame.event.wait(int(1000 / self.idle_fps))
+            if event.type != pygame.NOEVENT:
+                pygame.event.post(event)  # Handled by the next frame's event pump
+            elapsed = clock.tick()
+        else:
+            # With vsync the flip already waits for the display
+            elapsed = clock.tick(0 if self.vsync else self.fps)
+        self.quiet_ms += elapsed
+        return elapsed
+
+
+class GcControl:
+    """Keeps the cyclic garbage collector out of steady-state frames.
+
+    start() switches automatic collection off. transition() is called once
+    a scene has loaded: it collects everything and gc.freeze()s what
+    survives (surfaces, atlases, fonts, preloaded sounds), so later
+    collections never walk those objects again. From then on collections
+    only run where a pause cannot be seen: at the next transition and on
+    idle frames (end_frame(idle=True)). Steady frames allocate next to
+    nothing, but if the young generation still passes max_pending between
+    idle frames a generation-0 collection runs so garbage cannot pile up.
+
+    Every collection's pause is recorded through gc.callbacks, including
+    those started elsewhere, and tagged with what triggered it.
+    """
+
+    def __init__(self, max_pending=10000):
+        self.max_pending = max_pending
+        self.active = False
+        self.pauses = {}  # reason -> [ms]
+        self._reason = "other"
+        self._started = None
+
+    def start(self):
+        if self.active:
+            return
+        gc.disable()
+        gc.callbacks.append(self._on_gc)
+        self.active = True
+
+    def stop(self):
+        if not self.active:
+            return
+        gc.callbacks.remove(self._on_gc)
+        gc.unfreeze()
+        gc.enable()
+        self.active = False
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._started = time.perf_counter()
+        elif self._started is not None:
+            self.pauses.setdefault(self._reason, []).append((time.perf_counter() - self._started) * 1000)
+            self._started = None
+
+    def _collect(self, reason, generation=2):
+        self._reason = reason
+        try:
+            gc.collect(generation)
+        finally:
+            self._reason = "other"
+
+    def transition(self):
+        """A scene was loaded or unloaded: collect everything and freeze what is left"""
+        if not self.active:
+            return
+        gc.unfreeze()
+        self._collect("transition")
+        gc.freeze()
+
+    def end_frame(self, idle):
+        if not self.active:
+            return
+        pending = gc.get_count()[0]
+        if idle and pending:
+            self._collect("idle")
+        elif pending > self.max_pending:
+            self._collect("forced", 0)
+
+    def report(self):
+        if not self.pauses:
+            return "GC: no collections"
+        parts = [f"{reason} {len(ms)}x max {max(ms):.2f} ms" for reason, ms in sorted(self.pauses.items())]
+        return f"GC: {', '.join(parts)}; {gc.get_freeze_count()} objects frozen"
+
+
+def bench_idle(seconds=3.0):
+    """Process CPU use on the title screen at full rate and, once its background has paused, in idle mode"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from menu import Menu
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    menu = Menu(screen)
+    for idle in (False, True):
+        # Active: the background scrolls. Idle: the first step finds SCROLL_PAUSE_STEPS
+        # without input behind it and pauses the background, as on an unattended title screen
+        menu.quiet_steps = menu.SCROLL_PAUSE_STEPS if idle else 0
+        menu.bg.paused = False
+        clock = pygame.time.Clock()
+        loop = FixedStepLoop(idle=idle, idle_after_ms=0)
+        elapsed = loop.step_ms
+        frames = 0
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        while time.perf_counter() - wall_start < seconds:
+            for event in pygame.event.get():
+                loop.note_event(event)
+            for _ in loop.steps(elapsed):
+                menu.step()
+            menu.render(loop.alpha)
+            pygame.display.flip()
+            elapsed = loop.wait(clock, menu.animating)
+            frames += 1
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        print(f"{'idle' if idle else 'active':>6}: {frames / wall:5.1f} FPS, CPU {cpu / wall * 100:5.1f}%, "
+              f"{loop.step_count / wall:5.1f} steps/s")
+    menu.cleanup()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        bench_idle()
@@ -1,8 +1,18 @@
 import pygame
 import sys
+import assets
+import audio
+import display
+import replay
 from mouse import Mouse
-from menu import Menu
+from menu import Menu, MenuState
 from intro import Intro
+from render import DirtyRenderer
+from profiler import FrameProfiler, PerformanceOverlay, ProfileWriter
+from scenes import SceneManager
+from ui import EventRouter
+from loop import FixedStepLoop, GcControl
+from clock import RealClock
 
 # Add at the top
 class GameState:
@@ -21,9 +31,41 @@ class GameState:
     SIDEDECK = 12
     REPLAY = 13
 
-def main():
+def main(dirty_rects=False, clock=None, frames=None, profile=False, profile_path=None, archive=True,
+         audio_buffer=audio.MIXER_BUFFER, settings=None, idle=True, inputs=None, hardware_cursor=False,
+         gc_freeze=False):
+    """Run the game; dirty_rects presents only changed areas instead of flipping every frame.
+
+    clock is a clock.RealClock by default (benchmark.py passes a FixedStepClock) and
+    frames stops the loop after that many frames instead of running until quit.
+    profile turns the per-phase frame profiler on from the start (F3 toggles its
+    overlay at any time) and profile_path dumps its ring buffer to CSV/JSON.
+    archive serves images from export/assets.pak (see build_assets.py) if present.
+    audio_buffer is the mixer buffer in samples (lower = sound effects start sooner).
+    settings is a display.DisplaySettings with the launcher's resolution, fullscreen
+    and language options (default: 800x600 window, English).
+    idle lets the loop drop to a low redraw rate while nothing animates and
+    nobody touches the input (see loop.FixedStepLoop).
+    inputs is where events and cursor samples come from: replay.InputRecorder
+    to record a session, replay.InputPlayer (also passed as clock) to play one
+    back; default is live pygame input.
+    hardware_cursor lets the OS draw the cursor (see Mouse.use_hardware_cursor);
+    click ripples are still drawn by the game.
+    gc_freeze turns automatic garbage collection off and freezes each scene's
+    objects once it has loaded; collections then run only at scene switches
+    and on idle frames (see loop.GcControl).
+    """
+    if settings is None:
+        settings = display.DisplaySettings()
+    if inputs is None:
+        inputs = replay.LiveInput()
+    if archive:
+        assets.use_archive()
+    audio.pre_init(audio_buffer)
     pygame.init()
-    screen = pygame.display.set_mode((800, 600))
+    # A bank from an earlier run holds Channels and reservations of a mixer that has quit
+    audio.sfx = audio.SfxBank()
+    screen = settings.create_screen()
     pygame.display.set_caption("Yu-Gi-Oh! ONLINE 2")
     
     # Set icon (replace 'icon.ico' with your actual file)
@@ -32,35 +74,146 @@ def main():
         pygame.display.set_icon(icon)
     except:
         pass  # Skip if icon fails to load
-    clock = pygame.time.Clock()
-    start_time = pygame.time.get_ticks()
+    if clock is None:
+        clock = RealClock()
+    start_time = clock.get_ticks()
+    # Scenes are stepped at a fixed 60 Hz and read simulation time from the loop
+    loop = FixedStepLoop(start_ms=start_time, vsync=settings.vsync, idle=idle)
     # Hide default cursor
     pygame.mouse.set_visible(False)
-    mouse = Mouse(screen)
-    game = Intro(screen, 800, 600)
+    mouse = Mouse(screen, hardware=hardware_cursor)
+    mouse.get_pos = inputs.get_pos
+    mouse.get_pressed = inputs.get_pressed
+    mouse.get_ticks = loop.render_ticks  # Ripples are drawn every frame, between steps
+    # Every scene switch goes through the manager: exit() and unload() the old
+    # scene, enter() the new one
+    scenes = SceneManager()
+    collector = GcControl()
+    if gc_freeze:
+        collector.start()
+    game = scenes.switch("intro", lambda: Intro(screen, *screen.get_size(), clock=loop))
+    collector.transition()
     current_state = GameState.INTRO
-    while True:
-        for event in pygame.event.get():
+    # Load the menu's assets in the background while the intro plays
+    scenes.preload("menu", Menu.preload_jobs(screen.get_size()))
+    renderer = DirtyRenderer(screen, dirty_rects)
+    renderer.attach(game)
+    profiler = FrameProfiler(enabled=profile or profile_path is not None)
+    profiler.instrument(game, "step", "draw")
+    profiler.instrument(mouse, "update")
+    overlay = PerformanceOverlay(screen, profiler)
+    def toggle_overlay(event):
+        if event.key != pygame.K_F3:
+            return False
+        overlay.toggle()
+        return True
+    # Events go to the active scene; F3 is handled before any scene sees it
+    router = EventRouter()
+    router.on(pygame.KEYDOWN, toggle_overlay)
+    writer = None
+    if profile_path:
+        writer = ProfileWriter(profiler, profile_path)
+        writer.start()
+    frame = 0
+    elapsed = loop.step_ms  # The first frame runs one step
+    while frames is None or frame < frames:
+        frame += 1
+        profiler.begin_frame()
+        for event in inputs.get_events():
+            audio.sfx.mark_input(event)
+            mouse.note_input(event)
+            loop.note_event(event)
             if event.type == pygame.QUIT:
+                if renderer.enabled:
+                    print(f"Average pixels pushed per frame: {renderer.average_pixels_pushed():.0f}")
+                if writer is not None:
+                    writer.stop()
+                for line in scenes.memory_report(mouse=mouse, overlay=overlay):
+                    print(line)
+                scenes.leave()
+                for line in audio.music.report():
+                    print(line)
+                print(audio.sfx.latency_report())
+                for line in mouse.latency_report():
+                    print(line)
+                if collector.active:
+                    print(collector.report())
+                inputs.close()
                 pygame.quit()
                 sys.exit()
+            result = router.dispatch(event)
+            if result == MenuState.QUIT:
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
+        profiler.mark("events")
         # Here needs to do some stuff
-        screen.fill((0, 0, 0))  # Always black background
+        renderer.begin_frame(game, (mouse, overlay))  # Black background, or repair under the cursor
         if current_state == GameState.INTRO:
+            for _ in loop.steps(elapsed):
+                if game.current_state != 5:
+                    game.step()
             if game.current_state != 5:
-                game.update()
-            elif game.current_state == 5:
+                game.render(loop.alpha)
+            elif game.current_state == 5 and (inputs.deterministic or scenes.ready("menu")):
+                # Hand over only once the menu's assets are in memory; recorded
+                # and replayed sessions wait for them on this exact frame
+                scenes.wait("menu")
                 current_state = GameState.MAIN_MENU
-                game = None  # Let garbage collector handle it
+                scenes.leave()  # Release the intro's images now, not whenever it is collected
+                game = None
+                renderer.force_full_redraw()
         if current_state == GameState.MAIN_MENU:
             if game == None:
-                game = Menu(screen)
+                game = scenes.switch("menu", lambda: Menu(screen, settings.language))
+                if profile or profile_path is not None:
+                    print(scenes.report("menu"))
+                    print(assets.batch_report())
+                collector.transition()
+                renderer.attach(game)
+                router.set_scene(game)
+                profiler.instrument(game, "step", "draw")
+                elapsed = 0  # This frame's time was already stepped by the intro
             if game != None:
-                game.update()
+                for _ in loop.steps(elapsed):
+                    game.step()
+                game.render(loop.alpha)
+        profiler.mark("update")
 
         mouse.update()
-        pygame.display.flip()
-        clock.tick(60)
+        overlay.draw()
+        profiler.mark("mouse")
+        renderer.collect(game, mouse, overlay)
+        renderer.present()
+        mouse.presented()
+        profiler.mark("present")
+        audio.music.update()
+        elapsed = loop.wait(clock, game is None or game.animating or mouse.animating or overlay.visible)
+        inputs.end_frame(elapsed)
+        collector.end_frame(loop.idle)
+        profiler.mark("idle")
+        profiler.end_frame()
+    if writer is not None:
+        writer.stop()
+    scenes.leave()
+    collector.stop()
+    inputs.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    profile_path = sys.argv[sys.argv.index("--profile-out") + 1] if "--profile-out" in sys.argv[:-1] else None
+    audio_buffer = int(sys.argv[sys.argv.index("--audio-buffer") + 1]) if "--audio-buffer" in sys.argv[:-1] else audio.MIXER_BUFFER
+    settings = display.DisplaySettings.from_argv(sys.argv[1:])
+    options = dict(dirty_rects="--dirty-rects" in sys.argv, profile="--profile" in sys.argv, profile_path=profile_path,
+                   archive="--no-archive" not in sys.argv, audio_buffer=audio_buffer, settings=settings,
+                   idle="--no-idle" not in sys.argv, hardware_cursor="--hardware-cursor" in sys.argv,
+                   gc_freeze="--gc-freeze" in sys.argv)
+    if "--replay" in sys.argv[:-1]:
+        # Recorded input and frame times, replayed as fast as possible
+        player = replay.InputPlayer(sys.argv[sys.argv.index("--replay") + 1])
+        if player.screen_size != settings.resolution:
+            if "--resolution" in sys.argv:
+                sys.exit(f"Replay was recorded at {player.screen_size[0]}x{player.screen_size[1]}, "
+                         f"not {settings.resolution[0]}x{settings.resolution[1]}; mouse positions would not match")
+            settings.resolution = player.screen_size  # Replay at the recorded size unless one was asked for
+        options.update(clock=player, frames=player.frame_count, idle=False, inputs=player)
+    elif "--record" in sys.argv[:-1]:
+        options["inputs"] = replay.InputRecorder(sys.argv[sys.argv.index("--record") + 1], settings.resolution)
+    main(**options)
\ No newline at end of file
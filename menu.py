@@ -1,8 +1,57 @@
 import pygame
 import os
+import sys
+import time
+import functools
 from enum import Enum
+import assets
+import audio
+import display
+import ui
+from loop import INPUT_EVENTS
+from atlas import TextureAtlas, SpriteBatch
+from scenes import Scene
 # In your imports at the top (add this if not already there)
 from background import MenuBackground  # Assuming you have this in a separate file
+
+MENU_BGM = r"export\sound\bgm\y_gx_01.wav"
+MENU_BGM_FADE_MS = 1000
+
+# UI feedback sounds (name -> path); files that are missing are reported and skipped
+MENU_SFX = {
+    "click": r"export\sound\se\ui_click.wav",
+    "hover": r"export\sound\se\ui_hover.wav",
+}
+
+# Scale factors for different elements
+BUTTON_SCALE = 0.65  # Buttons will be 70% of original size
+LOGO_SCALE = 0.75    # Main logo scale
+CHAR_SCALE = 0.75    # Character scale (larger to go off-screen)
+SMALL_LOGO_SCALE = 0.6  # Konami logo scale
+COPYRIGHT_SCALE = 0.7
+
+TITLE_BUTTONS = [
+    r"export\data\title\title_botton_01_01_e.png",
+    r"export\data\title\title_botton_02_01_e.png",
+    r"export\data\title\title_botton_03_01_e.png",
+    r"export\data\title\title_botton_04_01_e.png",
+    r"export\data\title\title_botton_05_01_e.png",
+]
+TITLE_LOGO = r"export\data\title\title_title_01_e.png"
+KONAMI_LOGO = r"export\data\title\title_konami_01.png"
+YUGI = r"export\data\title\title_kyara_01.png"
+YUKI = r"export\data\title\title_kyara_02.png"
+COPYRIGHT = r"export\data\title\title_copy_01_e.png"
+
+# Every (path, scale) the title screen loads at 800x600, for Menu.preload_jobs()
+TITLE_IMAGES = [(path, BUTTON_SCALE) for path in TITLE_BUTTONS] + [
+    (TITLE_LOGO, LOGO_SCALE),
+    (KONAMI_LOGO, SMALL_LOGO_SCALE),
+    (YUGI, CHAR_SCALE),
+    (YUKI, CHAR_SCALE),
+    (COPYRIGHT, COPYRIGHT_SCALE),
+]
+
 class MenuState(Enum):
     START = 0
     TITLE = 1
@@ -16,84 +65,143 @@ class MenuState(Enum):
     CHARACTERCREATION_CLICK = 9
     LOADGAME = 10
 
-class Menu:
-    def __init__(self, screen):
+class Menu(Scene):
+    # Fixed steps without input before the background stops scrolling, so the
+    # main loop can drop into idle mode on an unattended title screen
+    SCROLL_PAUSE_STEPS = 30 * 60
+
+    def __init__(self, screen, language="english"):
         self.screen = screen
         self.screen_width, self.screen_height = screen.get_size()
+        # Layout is designed for 800x600; larger screens scale images and offsets
+        self.ui_scale = display.ui_scale(screen)
         self.current_state = MenuState.TITLE
+        # Dirty-rect rendering (see render.DirtyRenderer)
+        self.skip_unchanged = False
+        self.dirty_rects = []
+        
+        # Layout inputs of the cached title screen layers
+        self.language = language
+        self.hovered_button = None
+        self.use_static_cache = True
+        self.static_key = None
+        self.layer_below = None  # Opaque: fill colour + static background
+        self.layer_above = None  # Premultiplied alpha: characters, buttons and logos
+        self.static_rebuilds = 0
+        self.hit_index = ui.HitIndex()  # Buttons, registered once per layout
+        self.atlas = TextureAtlas()  # Buttons, logos and copyright share pages
+        self.use_sprite_batch = True
+        self.blit_calls = 0  # Blit calls of the last _draw_static_elements
         
+        # Decode every image (background too) on the thread pool at once; loads below convert them
+        assets.cache.prefetch_many(self.image_requests(screen.get_size()))
+
         # Initialize background
-        self.bg = MenuBackground(800, 600, screen)
+        self.bg = MenuBackground(self.screen_width, self.screen_height, screen)
         self.bg.running = True
+        self.quiet_steps = 0  # Steps since the last input event, see SCROLL_PAUSE_STEPS
         
          # Initialize audio
         self._init_audio()
+        self._init_sfx()
         
         # Load and scale all assets
         self._load_and_scale_assets()
+        self._pack_sprites()
         self._setup_positions()
         
     def _load_and_scale_assets(self):
         """Load and properly scale all title screen assets"""
         try:
-            # Scale factors for different elements
-            button_scale = 0.65  # Buttons will be 70% of original size
-            logo_scale = 0.75    # Main logo scale
-            char_scale = 0.75    # Character scale (larger to go off-screen)
-            small_logo_scale = 0.6  # Konami logo scale
-            
-            # Load and scale buttons (5 buttons)
-            self.buttons = [
-                self._load_scaled(r"export\data\title\title_botton_01_01_e.png", button_scale),
-                self._load_scaled(r"export\data\title\title_botton_02_01_e.png", button_scale),
-                self._load_scaled(r"export\data\title\title_botton_03_01_e.png", button_scale),
-                self._load_scaled(r"export\data\title\title_botton_04_01_e.png", button_scale),
-                self._load_scaled(r"export\data\title\title_botton_05_01_e.png", button_scale)
-            ]
-            
-            # Center logo (scaled down)
-            self.title_logo = self._load_scaled(r"export\data\title\title_title_01_e.png", logo_scale)
-            
-            # Konami small logo (scaled down more)
-            self.konami_logo = self._load_scaled(r"export\data\title\title_konami_01.png", small_logo_scale)
-            
-            # Character images (scaled up to go off-screen)
-            self.yugi = self._load_scaled(r"export\data\title\title_kyara_01.png", char_scale)
-            self.yuki = self._load_scaled(r"export\data\title\title_kyara_02.png", char_scale)
-            
-            # Bottom copyright text
-            self.copyright = self._load_scaled(r"export\data\title\title_copy_01_e.png", 0.7)
+            images = assets.load_images(self.title_requests(self.ui_scale))
+            count = len(TITLE_BUTTONS)
+            # Buttons (5), centre logo, Konami small logo, characters (scaled up to
+            # go off-screen) and the bottom copyright text, in TITLE_IMAGES order
+            self.buttons = images[:count]
+            self.title_logo, self.konami_logo, self.yugi, self.yuki, self.copyright = images[count:]
             
         except Exception as e:
             print(f"Error loading menu assets: {e}")
             self._create_fallback_assets()
     
     def _init_audio(self):
-        """Initialize background music"""
+        """Initialize the mixer for the background music enter() starts"""
         try:
             pygame.mixer.init()
-            self.bg_music = pygame.mixer.Sound(r"export\sound\bgm\y_gx_01.wav")
-            self.bg_music.set_volume(0.8)  # 50% volume
-            self.bg_music.play(loops=-1)  # Loop indefinitely
+            audio.music.volume = 0.8
+        except Exception as e:
+            print(f"Error loading background music: {e}")
+
+    def enter(self):
+        """Start the title music"""
+        try:
+            # Streamed, not loaded into memory; loops indefinitely
+            audio.music.play(MENU_BGM, fade_ms=MENU_BGM_FADE_MS)
         except Exception as e:
             print(f"Error loading background music: {e}")
-            # Create silent fallback
-            self.bg_music = pygame.mixer.Sound(buffer=bytearray(44))
+
+    def _init_sfx(self):
+        """Register the UI sounds on the reserved UI channels"""
+        for name, path in MENU_SFX.items():
+            audio.sfx.load(name, path, "ui")
 
     # ... [rest of your existing Menu class methods] ...
 
-    def cleanup(self):
-        """Clean up resources"""
-        self.bg_music.stop()  # Stop music when menu closes
-    
-    def _load_scaled(self, path, scale_factor):
-        """Load an image and scale it by the given factor"""
-        img = pygame.image.load(path).convert_alpha()
-        original_size = img.get_size()
-        new_size = (int(original_size[0] * scale_factor), 
-                    int(original_size[1] * scale_factor))
-        return pygame.transform.smoothscale(img, new_size)
+    @staticmethod
+    def title_requests(ui_scale):
+        """(path, load options) of TITLE_IMAGES, scaled by the UI scale"""
+        return [(path, dict(scale=scale * ui_scale, convert="auto", smooth=True)) for path, scale in TITLE_IMAGES]
+
+    @staticmethod
+    def image_requests(screen_size):
+        """Every image Menu(screen) loads, background first"""
+        ui_scale = screen_size[0] / display.LOGICAL_SIZE[0]
+        return MenuBackground.image_requests(screen_size) + Menu.title_requests(ui_scale)
+
+    @staticmethod
+    def preload_jobs(screen_size):
+        """Loads Menu(screen) will do, as callables that can run on a loader thread.
+
+        Images are only read (decoded and scaled, on a thread pool); Menu()
+        converts them to the display format on the main thread.
+        """
+        jobs = [functools.partial(assets.cache.prefetch_many, Menu.image_requests(screen_size))]
+        jobs.append(functools.partial(audio.music.queue_ahead, MENU_BGM))
+        jobs += [functools.partial(assets.load_sound, path) for path in MENU_SFX.values()]
+        return jobs
+
+    def exit(self):
+        """Stop the music and UI sounds"""
+        audio.music.stop()  # Stop music and release the stream when menu closes
+        for name in MENU_SFX:
+            entry = audio.sfx.sounds.get(name)
+            if entry is not None:
+                entry[0].stop()
+
+    def unload(self):
+        """Release every image and sound the title screen loaded or built"""
+        self.bg.unload()
+        assets.release_image(self.yugi)  # The other sprites were released into the atlas
+        assets.release_image(self.yuki)
+        self.atlas.clear()
+        self.buttons = []
+        self.title_logo = self.konami_logo = self.yugi = self.yuki = self.copyright = None
+        self.invalidate()
+        self.hit_index.clear()
+        for name, path in MENU_SFX.items():
+            audio.sfx.remove(name)
+            assets.release_sound(path)
     
+    def _pack_sprites(self):
+        """Move the UI sprites into the atlas; the characters stay separate surfaces"""
+        sprites = self.buttons + [self.title_logo, self.konami_logo, self.copyright]
+        packed = self.atlas.pack(sprites)
+        for original in sprites:
+            assets.release_image(original)  # The atlas holds the pixels now
+        count = len(self.buttons)
+        self.buttons = packed[:count]
+        self.title_logo, self.konami_logo, self.copyright = packed[count:]
+
     def _create_fallback_assets(self):
         """Create placeholder assets if loading fails"""
         # Create a simple button
@@ -109,14 +217,16 @@ class Menu:
     
     def _setup_positions(self):
         """Calculate all screen positions for the elements"""
+        px = lambda value: int(value * self.ui_scale)  # 800x600 offsets to screen pixels
+        
         # Title logo - top center (drawn above everything else)
         self.logo_pos = (
             (self.screen_width - self.title_logo.get_width()) // 2,
-            30  # 30px from top
+            px(30)  # 30px from top
         )
         
         # Konami logo - top left
-        self.konami_pos = (10, 10)
+        self.konami_pos = (px(10), px(10))
         
         # Characters - partially off-screen at bottom
         # Yugi (left side) - 30% off left edge
@@ -134,7 +244,7 @@ class Menu:
         # Buttons - stacked vertically with no spacing
         self.button_positions = []
         total_buttons_height = sum(btn.get_height() for btn in self.buttons)
-        start_y = self.screen_height - total_buttons_height - 85  # 50px from bottom
+        start_y = self.screen_height - total_buttons_height - px(85)  # 50px from bottom
         
         current_y = start_y
         for button in self.buttons:
@@ -142,53 +252,148 @@ class Menu:
             self.button_positions.append((x, current_y))
             current_y += button.get_height()  # No extra spacing
         
+        # Clickable only where the button art is opaque
+        self.hit_index.clear()
+        for i, (button, pos) in enumerate(zip(self.buttons, self.button_positions)):
+            self.hit_index.add(i, (pos, button.get_size()), image=button)
+        
         # Copyright text - bottom center (below buttons)
         self.copyright_pos = (
             (self.screen_width - self.copyright.get_width()) // 2,
-            self.screen_height - self.copyright.get_height() - 10  # 10px from bottom
+            self.screen_height - self.copyright.get_height() - px(10)  # 10px from bottom
         )
     
-    def draw_title_screen(self):
-        """Draw all title screen elements in correct order"""
-        # Dark blue background
-        self.screen.fill((20, 20, 50))  
-        
-        # Draw background first
-        self.bg.draw(self.screen)
+    def _static_layout_key(self):
+        # Only what the layers are drawn from; buttons have no hover/pressed art yet
+        return (self.screen.get_size(), self.language)
+
+    def _build_static_layers(self):
+        """Pre-composite everything that does not move into two layers"""
+        size = self.screen.get_size()
+        self.layer_below = pygame.Surface(size).convert()
+        self.layer_below.fill((20, 20, 50))
+        self.bg.draw_static(self.layer_below)
         
+        self.layer_above = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        self.layer_above.fill((0, 0, 0, 0))
+        # Compositing straight alpha onto a transparent layer would darken the
+        # soft edges, so the layer is built and drawn premultiplied
+        self._draw_static_elements(self.layer_above, premultiplied=True)
+        self.static_key = self._static_layout_key()
+        self.static_rebuilds += 1
+
+    def _draw_static_elements(self, target, premultiplied=False):
+        """Characters, buttons and logos, in title screen order"""
+        if self.use_sprite_batch:
+            # One blits() call per atlas page per layer
+            batch = SpriteBatch(target, self.atlas)
+            batch.draw(self.yugi, self.yugi_pos, layer=0)
+            batch.draw(self.yuki, self.yuki_pos, layer=0)
+            for button, pos in zip(self.buttons, self.button_positions):
+                batch.draw(button, pos, layer=1)
+            batch.draw(self.title_logo, self.logo_pos, layer=2)
+            batch.draw(self.konami_logo, self.konami_pos, layer=3)
+            batch.draw(self.copyright, self.copyright_pos, layer=3)
+            batch.flush(premultiplied)
+            self.blit_calls = batch.calls
+            return
+        self.blit_calls = 5 + len(self.buttons)
+        if premultiplied:
+            # Copy with convert_alpha() first: premul_alpha() on an atlas subsurface reads the
+            # wrong rows, and needs per-pixel alpha on opaque or colorkeyed sprites
+            blit = lambda img, pos: target.blit(img.convert_alpha().premul_alpha(), pos,
+                                                special_flags=pygame.BLEND_PREMULTIPLIED)
+        else:
+            blit = target.blit
         # Draw characters first (bottom layer)
-        self.screen.blit(self.yugi, self.yugi_pos)
-        self.screen.blit(self.yuki, self.yuki_pos)
+        blit(self.yugi, self.yugi_pos)
+        blit(self.yuki, self.yuki_pos)
         
         # Draw buttons next (middle layer)
         for button, pos in zip(self.buttons, self.button_positions):
-            self.screen.blit(button, pos)
+            blit(button, pos)
         
         # Draw title logo last (top layer - above everything)
-        self.screen.blit(self.title_logo, self.logo_pos)
+        blit(self.title_logo, self.logo_pos)
         
         # Draw Konami logo (top left)
-        self.screen.blit(self.konami_logo, self.konami_pos)
+        blit(self.konami_logo, self.konami_pos)
         
         # Draw copyright (very bottom)
-        self.screen.blit(self.copyright, self.copyright_pos)
+        blit(self.copyright, self.copyright_pos)
+
+    def draw_title_screen(self):
+        """Draw all title screen elements in correct order"""
+        if self.use_static_cache:
+            if self.static_key != self._static_layout_key():
+                self._build_static_layers()
+            # Static layers around the scrolling one: four blits per frame
+            self.screen.blit(self.layer_below, (0, 0))
+            self.bg.draw_animated(self.screen)
+            self.screen.blit(self.layer_above, (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+            return
+        
+        # Dark blue background
+        self.screen.fill((20, 20, 50))  
+        
+        # Draw background first
+        self.bg.draw(self.screen)
+        
+        self._draw_static_elements(self.screen)
+    
+    def invalidate(self):
+        """Drop the cached static layers; the next draw rebuilds them"""
+        self.layer_below = self.layer_above = None
+        self.static_key = None
+
+    def draw(self):
+        """Draw the current menu screen"""
+        if self.current_state == MenuState.TITLE:
+            self.draw_title_screen()
+            # The background scrolls, so the whole screen changes
+            self.dirty_rects.extend(self.bg.dirty_rects)
     
+    @property
+    def animating(self):
+        """The scrolling background layers change every frame, until they pause"""
+        return self.bg.animating
+
     def update(self):
         """Update menu state"""
+        self.step()
+        self.render()
+
+    def step(self):
+        """One fixed simulation step"""
+        self.quiet_steps += 1
+        if self.quiet_steps >= self.SCROLL_PAUSE_STEPS:
+            self.bg.paused = True
         self.bg.update()  # Update background animation
-        
-        if self.current_state == MenuState.TITLE:
-            self.draw_title_screen()
+
+    def render(self, blend=0.0):
+        """Draw the frame, blend (0..1) of the way towards the next step"""
+        self.bg.interpolation = blend
+        self.dirty_rects.clear()
+        self.draw()
     
+    def _button_at(self, mouse_pos):
+        return self.hit_index.at(mouse_pos)
+
     def handle_event(self, event):
         """Handle user input"""
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            mouse_pos = pygame.mouse.get_pos()
-            
-            for i, (button, pos) in enumerate(zip(self.buttons, self.button_positions)):
-                button_rect = pygame.Rect(pos, button.get_size())
-                if button_rect.collidepoint(mouse_pos):
-                    return self._handle_button_click(i)
+        if event.type in INPUT_EVENTS:
+            self.quiet_steps = 0
+            self.bg.paused = False
+        if event.type == pygame.MOUSEMOTION:
+            if self.hit_index.update_hover(event.pos):
+                self.hovered_button = self.hit_index.hovered
+                if self.hovered_button is not None:
+                    audio.sfx.play("hover")
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            i = self._button_at(event.pos)
+            if i is not None:
+                audio.sfx.play("click")
+                return self._handle_button_click(i)
         return None
     
     def _handle_button_click(self, button_index):
@@ -211,6 +416,7 @@ def test_menu():
     clock = pygame.time.Clock()
     
     menu = Menu(screen)
+    menu.enter()
     running = True
     
     while running:
@@ -230,5 +436,26 @@ def test_menu():
     
     pygame.quit()
 
+def bench_title(frames=600):
+    """Per-frame title screen cost with and without the cached static layers"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    menu = Menu(screen)
+    for cached in (False, True):
+        menu.use_static_cache = cached
+        menu.draw_title_screen()  # Builds the layers outside the timed loop
+        start = time.perf_counter()
+        for _ in range(frames):
+            menu.update()
+        elapsed = (time.perf_counter() - start) * 1000 / frames
+        print(f"{'cached layers' if cached else 'per-element':>13}: {elapsed:.3f} ms/frame")
+    menu.cleanup()
+    pygame.quit()
+
 if __name__ == "__main__":
-    test_menu()
\ No newline at end of file
+    if "--bench" in sys.argv:
+        bench_title()
+    else:
+        test_menu()
\ No newline at end of file
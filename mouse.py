@@ -2,80 +2,291 @@ import pygame
 import os
 import sys
 import math
+import time
+import assets
+from effects import EffectPool
+from tween import TweenEngine, Parallel, Tween
+from atlas import TextureAtlas, SpriteBatch
+
+CURSOR_DIR = os.path.join("export", "data", "common", "m_cursor")
+CLICK_IMAGE = os.path.join(CURSOR_DIR, "mausuk_e01_c01.png")
 
 class Mouse:
-    def __init__(self, screen):
+    def __init__(self, screen, clock=None, hardware=False):
         self.x = 0
         self.y = 0
         self.screen = screen
         self.mouse_buttons = []
-        self.click_animations = [] # Stores active animations
         self.is_clicking = False
-        # Load cursor images (normal/clicked states)
-        self.cursor_normal = pygame.image.load(os.path.join("export", "data", "common", "m_cursor", "mausuk_n01_c01.png")).convert_alpha()
-        self.cursor_clicked = pygame.image.load(os.path.join("export", "data", "common", "m_cursor", "mausuk_n02_c01.png")).convert_alpha()
-        self.cursor_normal_shadow = pygame.image.load(os.path.join("export", "data", "common", "m_cursor", "mausuk_n01_s.png")).convert_alpha()
-        self.cursor_clicked_shadow = pygame.image.load(os.path.join("export", "data", "common", "m_cursor", "mausuk_n02_s.png")).convert_alpha()
+        self.dirty_rects = [] # Screen area covered by cursor and ripples this frame
+        # Input and time sources, replaced by scripted ones in benchmark.py
+        self.get_pos = pygame.mouse.get_pos
+        self.get_pressed = pygame.mouse.get_pressed
+        self.get_ticks = clock.get_ticks if clock is not None else pygame.time.get_ticks
+        self.use_sprite_batch = True
+        self.blit_calls = 0  # Blit calls of the last draw()
+        # Input-to-present delay of the cursor, see note_input() and presented()
+        self.pending_input = {}  # "motion"/"press" -> time of the oldest input not on screen yet
+        self.latencies = {"motion": [], "press": []}  # ms
+        self.load_assets()
+        self.hardware = False
+        self.hardware_cursors = None
+        if hardware:
+            self.use_hardware_cursor(True)
     
+    @property
+    def animating(self):
+        return self.ripples.count > 0
+
     def load_assets(self):
-        # Load cursor images (normal/clicked states)
-        self.cursor_normal = pygame.image.load(os.path.join("export", "data", "common", "m_cursor", "mausuk_n01_c01.png")).convert_alpha()
-        self.cursor_clicked = pygame.image.load(os.path.join("export", "data", "common", "m_cursor", "mausuk_n02_c01.png")).convert_alpha()
-        self.cursor_normal_shadow = pygame.image.load(os.path.join("export", "data", "common", "m_cursor", "mausuk_n01_s.png")).convert_alpha()
-        self.cursor_clicked_shadow = pygame.image.load(os.path.join("export", "data", "common", "m_cursor", "mausuk_n02_s.png")).convert_alpha()
+        # Load cursor images (normal/clicked states) through the shared asset cache
+        self.cursor_normal = assets.load_image(os.path.join(CURSOR_DIR, "mausuk_n01_c01.png"))
+        self.cursor_clicked = assets.load_image(os.path.join(CURSOR_DIR, "mausuk_n02_c01.png"))
+        self.cursor_normal_shadow = assets.load_image(os.path.join(CURSOR_DIR, "mausuk_n01_s.png"))
+        self.cursor_clicked_shadow = assets.load_image(os.path.join(CURSOR_DIR, "mausuk_n02_s.png"))
+        # Cursor and shadow come from one atlas page, so a frame is one blits() call
+        cursors = [self.cursor_normal, self.cursor_clicked, self.cursor_normal_shadow, self.cursor_clicked_shadow]
+        self.atlas = TextureAtlas()
+        packed = self.atlas.pack(cursors)
+        for original in cursors:
+            assets.release_image(original)
+        self.cursor_normal, self.cursor_clicked, self.cursor_normal_shadow, self.cursor_clicked_shadow = packed
+        self.batch = SpriteBatch(self.screen, self.atlas)  # Reused every frame
+        # Click ripple stays referenced here and is baked once into a frame atlas
+        self.click_img = assets.load_image(CLICK_IMAGE)
+        self.ripple_atlas = RippleAtlas(self.click_img)
+        self.ripples = EffectPool(self.ripple_atlas, capacity=64)  # Active click animations
+
+    def _build_hardware_cursors(self):
+        """System cursors for both states: shadow and cursor composited around the hotspot"""
+        cursors = []
+        for cursor, shadow in ((self.cursor_normal, self.cursor_normal_shadow),
+                               (self.cursor_clicked, self.cursor_clicked_shadow)):
+            # Same placement as draw(): both images centred 16 px right of and below the pointer
+            rects = [img.get_rect(center=(16, 16)) for img in (shadow, cursor)]
+            bounds = rects[0].union(rects[1])
+            image = pygame.Surface(bounds.size, pygame.SRCALPHA).convert_alpha()
+            image.fill((0, 0, 0, 0))
+            for img, rect in zip((shadow, cursor), rects):
+                image.blit(img, rect.move(-bounds.x, -bounds.y))
+            cursors.append(pygame.cursors.Cursor((-bounds.x, -bounds.y), image))
+        return cursors
+
+    def use_hardware_cursor(self, enabled):
+        """Let the OS draw the cursor (no lag behind the pointer, no per-frame blits).
+
+        Ripples are still drawn by draw(). Falls back to the software cursor
+        where the video driver has no cursor support; returns whether the
+        hardware cursor is on.
+        """
+        if enabled:
+            try:
+                if self.hardware_cursors is None:
+                    self.hardware_cursors = self._build_hardware_cursors()
+                pygame.mouse.set_cursor(self.hardware_cursors[1 if self.is_clicking else 0])
+            except pygame.error as e:
+                print(f"Hardware cursor unavailable, using the software cursor: {e}")
+                enabled = False
+        self.hardware = enabled
+        pygame.mouse.set_visible(enabled)
+        return enabled
+
+    def note_input(self, event, timestamp=None):
+        """Start the latency clock for a mouse event (timestamp: perf_counter() seconds when it arrived)"""
+        if event.type == pygame.MOUSEMOTION:
+            kind = "motion"
+        elif event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            kind = "press"
+        else:
+            return
+        if timestamp is None:
+            # pygame does not pass SDL's event timestamps on; tests can post their own
+            timestamp = getattr(event, "timestamp", None) or time.perf_counter()
+        self.pending_input.setdefault(kind, timestamp)
+
+    def presented(self):
+        """Call right after the frame was presented: the cursor drawn in it is on screen"""
+        if self.hardware:
+            # The OS moves the cursor without waiting for a frame; state switches are timed in step()
+            self.pending_input.clear()
+            return
+        now = time.perf_counter()
+        for kind, timestamp in self.pending_input.items():
+            self.latencies[kind].append((now - timestamp) * 1000)
+        self.pending_input.clear()
+
+    def latency_report(self):
+        lines = []
+        for kind, samples in self.latencies.items():
+            if not samples:
+                continue
+            samples = sorted(samples)
+            lines.append(f"Cursor {kind} to {'cursor switch' if self.hardware else 'present'}: "
+                         f"{len(samples)} samples, mean {sum(samples) / len(samples):.2f} ms, "
+                         f"p95 {samples[int(len(samples) * 0.95)]:.2f} ms")
+        if self.hardware:
+            lines.append("Cursor motion: drawn by the OS, not tied to frames")
+        return lines
     
     def draw(self):
-        self.screen.blit(self.current_cursor_shadow,((self.x+16) - self.cursor_normal_shadow.get_width() // 2,(self.y+16) - self.cursor_normal_shadow.get_height() // 2))
-        self.screen.blit(self.current_cursor,((self.x+16) - self.cursor_normal.get_width() // 2,(self.y+16) - self.cursor_normal.get_height() // 2))
-    def update(self):
-        self.x, self.y = pygame.mouse.get_pos()
-        self.mouse_buttons = pygame.mouse.get_pressed()
+        if self.hardware:
+            self.blit_calls = 0
+            return
+        shadow_pos = ((self.x+16) - self.cursor_normal_shadow.get_width() // 2,(self.y+16) - self.cursor_normal_shadow.get_height() // 2)
+        cursor_pos = ((self.x+16) - self.cursor_normal.get_width() // 2,(self.y+16) - self.cursor_normal.get_height() // 2)
+        if self.use_sprite_batch:
+            self.batch.draw(self.current_cursor_shadow, shadow_pos)
+            self.batch.draw(self.current_cursor, cursor_pos)
+            self.dirty_rects.extend(self.batch.flush())
+            self.blit_calls = self.batch.calls
+            return
+        self.dirty_rects.append(self.screen.blit(self.current_cursor_shadow, shadow_pos))
+        self.dirty_rects.append(self.screen.blit(self.current_cursor, cursor_pos))
+        self.blit_calls = 2
+    def step(self):
+        """Sample the input and advance the ripples, without drawing"""
+        self.x, self.y = self.get_pos()
+        self.mouse_buttons = self.get_pressed()
         if self.mouse_buttons[0]:
             # Start a new animation at click position
             if self.is_clicking == False:
-                self.click_animations.append(ClickAnimation(self.x,self.y))
+                self.ripples.spawn(self.x, self.y, self.get_ticks())
                 self.is_clicking = True
-        else:
+                self._switch_hardware_cursor()
+        elif self.is_clicking:
             self.is_clicking = False
-        # Update and draw active click animations
-        for anim in self.click_animations[:]:  # Iterate over a copy to allow removal
-            if anim.update():
-                anim.draw(self.screen)
-            else:
-                self.click_animations.remove(anim)
+            self._switch_hardware_cursor()
+        # Drop finished click animations, pick the frame of the others
+        self.ripples.update(self.get_ticks())
+
+    def _switch_hardware_cursor(self):
+        if not self.hardware:
+            return
+        pygame.mouse.set_cursor(self.hardware_cursors[1 if self.is_clicking else 0])
+        timestamp = self.pending_input.pop("press", None)
+        if timestamp is not None:
+            self.latencies["press"].append((time.perf_counter() - timestamp) * 1000)
+
+    def update(self):
+        self.step()
+        # Draw active click animations
+        self.dirty_rects.clear()
+        rect = self.ripples.draw(self.screen)
+        if rect is not None:
+            self.dirty_rects.append(rect)
         # Draw current cursor (normal or clicked state)
         self.current_cursor = self.cursor_clicked if self.is_clicking else self.cursor_normal
         self.current_cursor_shadow = self.cursor_clicked_shadow if self.is_clicking else self.cursor_normal_shadow
         self.draw()
 
+class RippleAtlas:
+    """Click ripple frames with the scale/alpha curve baked in.
+
+    The curve is quantized into frame_steps frames once, so drawing a ripple
+    is a single blit of a cached frame instead of a scale and an alpha
+    multiply on a new surface every frame.
+    """
+    def __init__(self, base_img, initial_scale=0.1, final_scale=2.0, animation_duration=750, frame_steps=48):
+        self.base_img = base_img
+        self.initial_scale = initial_scale
+        self.final_scale = final_scale
+        self.animation_duration = animation_duration
+        self.frame_steps = max(2, frame_steps)
+        self.frames = []
+        self.offsets = [] # Half sizes, so frames can be drawn centered
+        for i in range(self.frame_steps):
+            progress = i / (self.frame_steps - 1)
+            frame = self._render(progress)
+            self.frames.append(frame)
+            self.offsets.append((frame.get_width() // 2, frame.get_height() // 2))
+
+    def scale_at(self, progress):
+        return self.initial_scale + (self.final_scale - self.initial_scale) * progress
+
+    def _render(self, progress):
+        scale = self.scale_at(progress)
+        width = int(self.base_img.get_width() * scale)
+        height = int(self.base_img.get_height() * scale)
+        frame = pygame.transform.scale(self.base_img, (width, height))
+        alpha = int(255 * (1.0 - progress))
+        if alpha < 255:
+            frame.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+        return frame
+
+    def frame_index(self, progress):
+        return min(int(progress * self.frame_steps), self.frame_steps - 1)
+
+    def byte_size(self):
+        return sum(frame.get_pitch() * frame.get_height() for frame in self.frames)
+
+
+_default_atlas = None
+
+def get_ripple_atlas():
+    """Atlas shared by ClickAnimations created without one"""
+    global _default_atlas
+    if _default_atlas is None:
+        _default_atlas = RippleAtlas(assets.load_image(CLICK_IMAGE))
+    return _default_atlas
+
 class ClickAnimation:
-    def __init__(self, x, y):
+    def __init__(self, x, y, atlas=None, get_ticks=None, tweens=None):
+        """tweens is a TweenEngine shared by many ripples and updated once per frame by
+        its owner; without one each ripple updates a private engine in update()"""
         self.x = x
         self.y = y
-        self.start_time = pygame.time.get_ticks()
-        # Load click animation frames (assuming mausuk_e01_c01.png is the base frame)
-        self.base_img = pygame.image.load(os.path.join("export", "data", "common", "m_cursor", "mausuk_e01_c01.png")).convert_alpha() 
-        self.animation_duration = 750 # 1 second (in ms)
-        self.initial_scale = 0.1 # Starts at 50% size
-        self.final_scale = 2.0 # Grows to 200% size
+        self.get_ticks = get_ticks if get_ticks is not None else pygame.time.get_ticks
+        # Pre-rendered frames of mausuk_e01_c01.png along the scale/alpha curve
+        self.atlas = atlas if atlas is not None else get_ripple_atlas()
+        self.base_img = self.atlas.base_img
+        self.animation_duration = self.atlas.animation_duration # 0.75 seconds (in ms)
+        self.initial_scale = self.atlas.initial_scale # Starts at 10% size
+        self.final_scale = self.atlas.final_scale # Grows to 200% size
+        self.frame = 0
+        self.current_scale = self.initial_scale
+        self.alpha = 255
+        self.tweens = tweens if tweens is not None else TweenEngine(capacity=4)  # Room for its three tweens
+        self.owns_tweens = tweens is None
+        self.playback = None
+        self.restart(self.get_ticks())
+
+    def restart(self, start_time):
+        """Play the ripple from the beginning as if it had started at start_time"""
+        if self.playback is not None:
+            self.playback.stop()
+        self.start_time = start_time
+        duration = self.animation_duration # 0.0 to 1.0 progress over 0.75 seconds
+        self.playback = self.tweens.play(Parallel(
+            Tween(duration, self.initial_scale, self.final_scale, apply=self._set_scale),
+            Tween(duration, 255, 0, apply=self._set_alpha),
+            Tween(duration, 0, 1, apply=self._set_progress),  # Picks the baked frame
+        ), start_time)
+
+    def _set_scale(self, scale):
+        self.current_scale = scale
+
+    def _set_alpha(self, alpha):
+        self.alpha = int(alpha)
+
+    def _set_progress(self, progress):
+        self.frame = self.atlas.frame_index(progress)
         
     def load_assets(self):
         # Load click animation frames (assuming mausuk_e01_c01.png is the base frame)
-        self.click_animation_img = pygame.image.load(os.path.join("export", "data", "common", "m_cursor", "mausuk_e01_c01.png")).convert_alpha()
+        self.click_animation_img = assets.load_image(CLICK_IMAGE, retain=False)
 
     def update(self):
-        elapsed = pygame.time.get_ticks() - self.start_time
-        progress = min(elapsed / self.animation_duration, 1.0)  # 0.0 to 1.0
-        
-        # Scale from INITIAL_SCALE to FINAL_SCALE
-        self.current_scale = self.initial_scale + (self.final_scale - self.initial_scale) * progress
-        
-        # Alpha from 255 to 0
-        self.alpha = int(255 * (1.0 - progress))
-        
-        return progress < 1.0  # True = still active
+        if self.owns_tweens:
+            self.tweens.update(self.get_ticks())
+        return not self.playback.finished  # True = still active
     
     def draw(self, surface):
+        # Single blit of the baked frame, centered at position
+        half_w, half_h = self.atlas.offsets[self.frame]
+        return surface.blit(self.atlas.frames[self.frame], (self.x - half_w, self.y - half_h))
+
+    def draw_scaled(self, surface):
+        """Previous per-frame path (scale + alpha multiply), kept for bench_ripples"""
         # Create scaled surface
         width = int(self.base_img.get_width() * self.current_scale)
         height = int(self.base_img.get_height() * self.current_scale)
@@ -86,16 +297,16 @@ class ClickAnimation:
             scaled_img.fill((255, 255, 255, self.alpha), special_flags=pygame.BLEND_RGBA_MULT)
         
         # Draw centered at position
-        surface.blit(scaled_img, (self.x - width//2, self.y - height//2))
+        return surface.blit(scaled_img, (self.x - width//2, self.y - height//2))
         
-def test_mouse():
+def test_mouse(hardware=False):
     pygame.init()
     screen = pygame.display.set_mode((800, 600))
     pygame.display.set_caption("Yu-Gi-Oh! Mouse Test")
     clock = pygame.time.Clock()
     # Hide default cursor
     pygame.mouse.set_visible(False)
-    mouse = Mouse(screen)
+    mouse = Mouse(screen, hardware=hardware)
     
     while True:
         for event in pygame.event.get():
@@ -107,5 +318,111 @@ def test_mouse():
         pygame.display.flip()
         clock.tick(60)
 
+def bench_ripples(counts=(1, 10, 100), frames=300):
+    """Compare per-frame ripple cost of the baked atlas against the old scale path"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    atlas = RippleAtlas(assets.load_image(CLICK_IMAGE))
+    print(f"atlas: {atlas.frame_steps} frames, {atlas.byte_size() / 1024:.0f} KiB")
+    for count in counts:
+        results = {}
+        for name in ("scaled", "atlas"):
+            # One shared engine on a simulated 60 Hz clock, created outside the timed loop
+            now = [1000.0]
+            tweens = TweenEngine()
+            anims = [ClickAnimation(50 + (i * 37) % 700, 50 + (i * 53) % 500, atlas, lambda: now[0], tweens)
+                     for i in range(count)]
+            for i, anim in enumerate(anims):
+                anim.restart(now[0] - i * 7 % anim.animation_duration)  # Spread across the whole curve
+            start = time.perf_counter()
+            for frame in range(frames):
+                now[0] += 1000 / 60
+                tweens.update(now[0])
+                finished = [anim for anim in anims if not anim.update()]
+                if finished:
+                    for anim in finished:
+                        anim.restart(now[0])  # Keep it alive; once per 0.75 s per ripple
+                    tweens.update(now[0])
+                for anim in anims:
+                    if name == "atlas":
+                        anim.draw(screen)
+                    else:
+                        anim.draw_scaled(screen)
+            results[name] = (time.perf_counter() - start) * 1000 / frames
+        print(f"{count:4d} ripples: scaled {results['scaled']:.3f} ms/frame, "
+              f"atlas {results['atlas']:.3f} ms/frame ({results['scaled'] / results['atlas']:.1f}x)")
+    pygame.quit()
+
+def bench_cursor_latency(seconds=3.0, fps=60):
+    """Input-to-present delay of the cursor over the title screen, software and hardware cursor.
+
+    A thread posts mouse events stamped with the time they were posted, at
+    random points of the frame like real input, so the delay includes the
+    wait in the event queue until the next frame starts.
+    """
+    import random
+    import threading
+    from menu import Menu
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    menu = Menu(screen)
+    for hardware in (False, True):
+        mouse = Mouse(screen, hardware=hardware)
+        if hardware and not mouse.hardware:
+            print("hardware: not supported by this video driver")
+            break
+        state = {"pos": (400, 300), "pressed": (False, False, False)}
+        mouse.get_pos = lambda: state["pos"]
+        mouse.get_pressed = lambda: state["pressed"]
+        stop = threading.Event()
+
+        def post_input():
+            rng = random.Random(1)
+            pressed = False
+            while not stop.wait(rng.uniform(0.002, 0.030)):
+                if rng.random() < 0.2:
+                    pressed = not pressed
+                    event_type = pygame.MOUSEBUTTONDOWN if pressed else pygame.MOUSEBUTTONUP
+                    pygame.event.post(pygame.event.Event(event_type, pos=(400, 300), button=1,
+                                                         timestamp=time.perf_counter()))
+                else:
+                    pos = (rng.randrange(800), rng.randrange(600))
+                    pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0),
+                                                         buttons=(int(pressed), 0, 0),
+                                                         timestamp=time.perf_counter()))
+
+        poster = threading.Thread(target=post_input, daemon=True)
+        clock = pygame.time.Clock()
+        poster.start()
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            for event in pygame.event.get():
+                mouse.note_input(event)
+                if hasattr(event, "pos"):
+                    state["pos"] = event.pos
+                if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                    state["pressed"] = (event.type == pygame.MOUSEBUTTONDOWN, False, False)
+            menu.update()
+            mouse.update()
+            pygame.display.flip()
+            mouse.presented()
+            clock.tick(fps)
+        stop.set()
+        poster.join()
+        print(f"{'hardware' if hardware else 'software'}:")
+        for line in mouse.latency_report():
+            print(f"  {line}")
+        mouse.use_hardware_cursor(False)
+    menu.cleanup()
+    pygame.quit()
+
 if __name__ == "__main__":
-    test_mouse()
\ No newline at end of file
+    if "--bench" in sys.argv:
+        bench_ripples()
+    elif "--latency" in sys.argv:
+        bench_cursor_latency()
+    else:
+        test_mouse("--hardware-cursor" in sys.argv)
\ No newline at end of file
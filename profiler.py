@@ -0,0 +1,228 @@
+import os
+import csv
+import json
+import time
+import threading
+import pygame
+
+
+class FrameProfiler:
+    """Per-phase frame timings kept in a fixed-size ring buffer.
+
+    The main loop calls begin_frame(), then mark(phase) at the end of each
+    phase and end_frame() once the frame is done. Scene methods can be wrapped
+    with instrument(), which records their time under "Class.method". While
+    disabled every hook returns straight away.
+    """
+
+    def __init__(self, capacity=600, enabled=False):
+        self.capacity = capacity
+        self._enabled = enabled
+        self.columns = {}  # phase -> [ms] * capacity
+        self.frame_ms = [0.0] * capacity
+        self.index = 0  # Next slot to write
+        self.count = 0  # Frames stored so far (up to capacity)
+        self.lock = threading.Lock()
+        self._current = {}
+        self._frame_start = 0.0
+        self._last = 0.0
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled):
+        # Switched on or off mid-frame: the frame in progress is not recorded
+        self._enabled = enabled
+        self._current.clear()
+        self._frame_start = self._last = 0.0
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._frame_start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """Close the phase that started at the previous mark"""
+        if not self.enabled or self._frame_start == 0.0:
+            return  # Off, or switched on mid-frame: wait for the next begin_frame()
+        now = time.perf_counter()
+        self._current[phase] = self._current.get(phase, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    def add(self, phase, ms):
+        if not self.enabled or self._frame_start == 0.0:
+            return
+        self._current[phase] = self._current.get(phase, 0.0) + ms
+
+    def end_frame(self):
+        if not self.enabled or self._frame_start == 0.0:
+            self._current.clear()
+            return
+        total = (time.perf_counter() - self._frame_start) * 1000
+        with self.lock:
+            for phase in self._current:
+                if phase not in self.columns:
+                    self.columns[phase] = [0.0] * self.capacity
+            for phase, column in self.columns.items():
+                column[self.index] = self._current.get(phase, 0.0)
+            self.frame_ms[self.index] = total
+            self.index = (self.index + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+        self._current.clear()
+        self._frame_start = 0.0
+
+    def instrument(self, obj, *methods):
+        """Time obj's methods under "Class.method" (instance attributes shadow the class)"""
+        for name in methods:
+            method = getattr(obj, name)
+            phase = f"{type(obj).__name__}.{name}"
+            setattr(obj, name, self._timed(method, phase))
+
+    def _timed(self, method, phase):
+        def timed(*args, **kwargs):
+            if not self.enabled:
+                return method(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.add(phase, (time.perf_counter() - start) * 1000)
+        return timed
+
+    def _ordered(self, values):
+        """Ring buffer contents oldest first"""
+        if self.count < self.capacity:
+            return values[:self.count]
+        return values[self.index:] + values[:self.index]
+
+    def recent_frames(self):
+        return self._ordered(self.frame_ms)
+
+    def snapshot(self):
+        """Copy of the buffer as {"frame_ms": [...], phase: [...]}, oldest first"""
+        with self.lock:
+            data = {"frame_ms": self._ordered(self.frame_ms)}
+            for phase, column in self.columns.items():
+                data[phase] = self._ordered(column)
+        return data
+
+    def top_phases(self, n=3):
+        """(phase, mean ms) of the n most expensive phases in the buffer"""
+        if not self.count:
+            return []
+        with self.lock:
+            # Slots not written yet are still 0.0, so summing whole columns is fine
+            means = [(phase, sum(column) / self.count) for phase, column in self.columns.items()]
+        means.sort(key=lambda item: item[1], reverse=True)
+        return means[:n]
+
+
+class PerformanceOverlay:
+    """FPS, frame-time graph and top phases drawn in the top-right corner"""
+
+    WIDTH = 220
+    HEIGHT = 96
+    GRAPH_HEIGHT = 40
+    BUDGET_MS = 1000 / 60
+
+    def __init__(self, screen, profiler, refresh_ms=250):
+        self.screen = screen
+        self.profiler = profiler
+        self.visible = False
+        self.refresh_ms = refresh_ms
+        self.rect = pygame.Rect(screen.get_width() - self.WIDTH - 4, 4, self.WIDTH, self.HEIGHT)
+        self.panel = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.dirty_rects = []
+        self.font = None
+        self._last_refresh = 0.0
+        self._profiler_was_enabled = profiler.enabled
+
+    def toggle(self):
+        self.visible = not self.visible
+        # The overlay has nothing to show while the profiler is off; hiding it
+        # leaves the profiler as it was (e.g. still on for --profile-out)
+        if self.visible:
+            self._profiler_was_enabled = self.profiler.enabled
+            self.profiler.enabled = True
+        else:
+            self.profiler.enabled = self._profiler_was_enabled
+        # Shown: repair what will be under the panel; hidden: the renderer
+        # repairs where it was last drawn before draw() clears the list
+        self.dirty_rects.clear()
+        self.dirty_rects.append(self.rect)
+
+    def _refresh(self):
+        """Re-render the panel; text is only redrawn a few times per second"""
+        if self.font is None:
+            pygame.font.init()
+            self.font = pygame.font.Font(None, 16)
+        frames = self.profiler.recent_frames()[-self.WIDTH:]
+        self.panel.fill((0, 0, 0, 170))
+        if frames:
+            mean = sum(frames) / len(frames)
+            fps = 1000 / mean if mean else 0
+            lines = [f"{fps:5.1f} FPS  {mean:5.2f} ms  max {max(frames):5.2f} ms"]
+            lines += [f"{phase[:22]:<22} {ms:5.2f} ms" for phase, ms in self.profiler.top_phases(3)]
+            for i, line in enumerate(lines):
+                self.panel.blit(self.font.render(line, True, (230, 230, 230)), (4, 3 + i * 13))
+            # One bar per frame, red above the 60 FPS budget
+            base = self.HEIGHT - 2
+            scale = self.GRAPH_HEIGHT / (2 * self.BUDGET_MS)
+            x = self.WIDTH - len(frames)
+            for ms in frames:
+                height = min(self.GRAPH_HEIGHT, int(ms * scale))
+                color = (230, 60, 60) if ms > self.BUDGET_MS else (80, 220, 80)
+                pygame.draw.line(self.panel, color, (x, base), (x, base - height))
+                x += 1
+            budget_y = base - int(self.BUDGET_MS * scale)
+            pygame.draw.line(self.panel, (200, 200, 200), (0, budget_y), (self.WIDTH, budget_y))
+
+    def draw(self):
+        self.dirty_rects.clear()
+        if not self.visible:
+            return
+        now = time.perf_counter() * 1000
+        if now - self._last_refresh >= self.refresh_ms:
+            self._refresh()
+            self._last_refresh = now
+        self.dirty_rects.append(self.screen.blit(self.panel, self.rect))
+
+
+class ProfileWriter(threading.Thread):
+    """Dumps the profiler's ring buffer to CSV or JSON (by extension) in the background"""
+
+    def __init__(self, profiler, path, interval=5.0):
+        super().__init__(name="ProfileWriter", daemon=True)
+        self.profiler = profiler
+        self.path = path
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.write()
+
+    def stop(self):
+        """Stop the thread and write the buffer one last time"""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
+        self.write()
+
+    def write(self):
+        data = self.profiler.snapshot()
+        if not data["frame_ms"]:
+            return
+        tmp_path = self.path + ".tmp"
+        if self.path.lower().endswith(".json"):
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+        else:
+            phases = list(data)
+            with open(tmp_path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(phases)
+                writer.writerows(zip(*(data[phase] for phase in phases)))
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,81 @@
+import pygame
+
+
+class DirtyRenderer:
+    """Presents only the parts of the screen that changed this frame.
+
+    Disabled, it does what the main loop always did: clear to black and flip
+    the whole screen. Enabled, scenes skip redrawing when nothing changed and
+    report the rects they touched in their dirty_rects list; overlays drawn
+    on top (the mouse) get the area they covered last frame repaired by the
+    scene underneath. Only those rects are pushed with display.update().
+    """
+
+    def __init__(self, screen, enabled=False):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.enabled = enabled
+        self.full_redraw = True
+        self.rects = []
+        self.pixels_pushed = 0  # Pixels sent to the display last frame
+        self.total_pixels_pushed = 0
+        self.frames = 0
+
+    def attach(self, *scenes):
+        """Tell scenes whether they may skip drawing when nothing changed"""
+        for scene in scenes:
+            scene.skip_unchanged = self.enabled
+
+    def force_full_redraw(self):
+        """Call on scene switches: the next frame is cleared and fully presented"""
+        self.full_redraw = True
+
+    def begin_frame(self, scene, overlays=()):
+        """Clear the screen, or repair what the overlays covered last frame"""
+        self.rects = []
+        if not self.enabled or self.full_redraw:
+            self.screen.fill((0, 0, 0))
+            if scene is not None and hasattr(scene, "invalidate"):
+                scene.invalidate()
+            return
+        for overlay in overlays:
+            for rect in overlay.dirty_rects:
+                self.repair(scene, rect)
+
+    def repair(self, scene, rect):
+        """Redraw the scene underneath rect only"""
+        rect = rect.clip(self.screen_rect)
+        if not rect:
+            return
+        self.screen.set_clip(rect)
+        self.screen.fill((0, 0, 0))
+        if scene is not None:
+            scene.draw()
+        self.screen.set_clip(None)
+        self.rects.append(rect)
+
+    def collect(self, *sources):
+        for source in sources:
+            if source is not None:
+                self.rects.extend(source.dirty_rects)
+
+    def present(self):
+        full = not self.enabled or self.full_redraw
+        if not full:
+            rects = [rect.clip(self.screen_rect) for rect in self.rects]
+            rects = [rect for rect in rects if rect]
+            pixels = sum(rect.width * rect.height for rect in rects)
+            if pixels >= self.screen_rect.width * self.screen_rect.height:
+                full = True
+        if full:
+            pygame.display.flip()
+            pixels = self.screen_rect.width * self.screen_rect.height
+        elif rects:
+            pygame.display.update(rects)
+        self.full_redraw = False
+        self.pixels_pushed = pixels
+        self.total_pixels_pushed += pixels
+        self.frames += 1
+
+    def average_pixels_pushed(self):
+        return self.total_pixels_pushed / self.frames if self.frames else 0
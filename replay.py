@@ -0,0 +1,276 @@
+import time
+import struct
+import pygame
+
+# Events worth reproducing; window/system events are not recorded
+MOUSEMOTION = 1
+MOUSEBUTTONDOWN = 2
+MOUSEBUTTONUP = 3
+MOUSEWHEEL = 4
+KEYDOWN = 5
+KEYUP = 6
+QUIT = 7
+EVENT_CODES = {
+    pygame.MOUSEMOTION: MOUSEMOTION,
+    pygame.MOUSEBUTTONDOWN: MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP: MOUSEBUTTONUP,
+    pygame.MOUSEWHEEL: MOUSEWHEEL,
+    pygame.KEYDOWN: KEYDOWN,
+    pygame.KEYUP: KEYUP,
+    pygame.QUIT: QUIT,
+}
+EVENT_TYPES = {code: event_type for event_type, code in EVENT_CODES.items()}
+
+
+def write_varint(out, value):
+    """Unsigned LEB128"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def write_signed(out, value):
+    write_varint(out, (value << 1) ^ (value >> 63))  # Zigzag: small negatives stay small
+
+
+def read_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def read_signed(data, offset):
+    value, offset = read_varint(data, offset)
+    return (value >> 1) ^ -(value & 1), offset
+
+
+def button_bits(buttons):
+    return sum(1 << i for i, pressed in enumerate(buttons[:3]) if pressed)
+
+
+def bits_to_buttons(bits):
+    return tuple(bool(bits & (1 << i)) for i in range(3))
+
+
+class LiveInput:
+    """Input as main.main() reads it by default: straight from pygame"""
+
+    # Recorded and replayed sessions must not depend on how fast background
+    # work finishes, so main() blocks on it instead of polling
+    deterministic = False
+
+    def get_events(self):
+        return pygame.event.get()
+
+    def get_pos(self):
+        return pygame.mouse.get_pos()
+
+    def get_pressed(self):
+        return pygame.mouse.get_pressed()
+
+    def end_frame(self, elapsed_ms):
+        pass
+
+    def close(self):
+        pass
+
+
+class InputRecorder(LiveInput):
+    """Records the input main.main() and Mouse.update consume, frame by frame.
+
+    Each frame stores the elapsed time the loop measured, the events
+    pumped, and the cursor position/buttons Mouse.update sampled. The
+    elapsed time is kept as the exact double the loop was fed, so replay
+    runs the same fixed steps with the same interpolation; positions are
+    written as varint deltas from the previous frame.
+
+    Layout: MAGIC, uint16 screen width, uint16 screen height, then frames of
+      float64 elapsed ms, varint event count,
+      events (varint code + type-specific fields), signed dx, signed dy, button bits
+    """
+
+    MAGIC = b"YO2REC2\0"
+    deterministic = True
+
+    def __init__(self, path, screen_size=(800, 600)):
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(self.MAGIC + struct.pack("<HH", *screen_size))
+        self._events = []
+        self._pos = (0, 0)
+        self._pressed = (False, False, False)
+        self._last_pos = (0, 0)
+        self.frames = 0
+        self.bytes_written = len(self.MAGIC) + 4
+
+    def get_events(self):
+        events = pygame.event.get()
+        self._events.extend(event for event in events if event.type in EVENT_CODES)
+        return events
+
+    def get_pos(self):
+        self._pos = pygame.mouse.get_pos()
+        return self._pos
+
+    def get_pressed(self):
+        self._pressed = pygame.mouse.get_pressed()
+        return self._pressed
+
+    def _write_pos(self, out, pos):
+        write_signed(out, pos[0] - self._last_pos[0])
+        write_signed(out, pos[1] - self._last_pos[1])
+        self._last_pos = pos
+
+    def _write_event(self, out, event):
+        code = EVENT_CODES[event.type]
+        write_varint(out, code)
+        if code == MOUSEMOTION:
+            self._write_pos(out, event.pos)
+            write_signed(out, event.rel[0])
+            write_signed(out, event.rel[1])
+            out.append(button_bits(event.buttons))
+        elif code in (MOUSEBUTTONDOWN, MOUSEBUTTONUP):
+            self._write_pos(out, event.pos)
+            write_varint(out, event.button)
+        elif code == MOUSEWHEEL:
+            write_signed(out, event.x)
+            write_signed(out, event.y)
+        elif code in (KEYDOWN, KEYUP):
+            write_varint(out, event.key)
+            write_varint(out, event.mod)
+            write_varint(out, getattr(event, "scancode", 0))
+            text = getattr(event, "unicode", "")
+            write_varint(out, ord(text) if len(text) == 1 else 0)
+
+    def end_frame(self, elapsed_ms):
+        out = bytearray(struct.pack("<d", elapsed_ms))
+        write_varint(out, len(self._events))
+        for event in self._events:
+            self._write_event(out, event)
+        self._write_pos(out, self._pos)
+        out.append(button_bits(self._pressed))
+        self._file.write(out)
+        self.bytes_written += len(out)
+        self.frames += 1
+        self._events = []
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+            print(f"Recorded {self.frames} frames to {self.path} ({self.bytes_written} bytes)")
+
+
+class InputPlayer:
+    """Plays a recording back through main.main() as both input source and clock.
+
+    tick() returns each frame's recorded duration without sleeping, so a
+    session replays headless and as fast as the game can render it, with
+    the same simulation steps as when it was recorded. Wall time between
+    ticks lands in frame_times, like clock.FixedStepClock. QUIT events
+    are dropped so main() returns normally after the last frame.
+    """
+
+    deterministic = True
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(InputRecorder.MAGIC):
+            raise ValueError(f"{path} is not an input recording")
+        offset = len(InputRecorder.MAGIC)
+        self.screen_size = struct.unpack_from("<HH", data, offset)
+        self.frames = self._decode(data, offset + 4)  # [(elapsed_ms, events, pos, pressed)]
+        self.frame = 0
+        self.now = 1.0  # Scenes treat a start time of 0 as "not started yet"
+        self.frame_times = []
+        self._last = time.perf_counter()
+
+    @property
+    def frame_count(self):
+        return len(self.frames)
+
+    @staticmethod
+    def _decode(data, offset):
+        frames = []
+        last = [0, 0]
+
+        def read_pos(offset):
+            dx, offset = read_signed(data, offset)
+            dy, offset = read_signed(data, offset)
+            last[0] += dx
+            last[1] += dy
+            return (last[0], last[1]), offset
+
+        while offset < len(data):
+            elapsed_ms, = struct.unpack_from("<d", data, offset)
+            offset += 8
+            count, offset = read_varint(data, offset)
+            events = []
+            for _ in range(count):
+                code, offset = read_varint(data, offset)
+                attrs = {}
+                if code == MOUSEMOTION:
+                    attrs["pos"], offset = read_pos(offset)
+                    rel_x, offset = read_signed(data, offset)
+                    rel_y, offset = read_signed(data, offset)
+                    attrs["rel"] = (rel_x, rel_y)
+                    attrs["buttons"] = tuple(int(b) for b in bits_to_buttons(data[offset]))
+                    offset += 1
+                elif code in (MOUSEBUTTONDOWN, MOUSEBUTTONUP):
+                    attrs["pos"], offset = read_pos(offset)
+                    attrs["button"], offset = read_varint(data, offset)
+                elif code == MOUSEWHEEL:
+                    attrs["x"], offset = read_signed(data, offset)
+                    attrs["y"], offset = read_signed(data, offset)
+                elif code in (KEYDOWN, KEYUP):
+                    attrs["key"], offset = read_varint(data, offset)
+                    attrs["mod"], offset = read_varint(data, offset)
+                    attrs["scancode"], offset = read_varint(data, offset)
+                    char, offset = read_varint(data, offset)
+                    attrs["unicode"] = chr(char) if char else ""
+                if code != QUIT:
+                    events.append(pygame.event.Event(EVENT_TYPES[code], attrs))
+            pos, offset = read_pos(offset)
+            pressed = bits_to_buttons(data[offset])
+            offset += 1
+            frames.append((elapsed_ms, events, pos, pressed))
+        return frames
+
+    def _current(self):
+        return self.frames[min(self.frame, len(self.frames) - 1)]
+
+    def get_events(self):
+        pygame.event.pump()  # Keep SDL serviced; live events are ignored
+        return list(self._current()[1])
+
+    def get_pos(self):
+        return self._current()[2]
+
+    def get_pressed(self):
+        return self._current()[3]
+
+    def end_frame(self, elapsed_ms):
+        pass
+
+    def close(self):
+        pass
+
+    # Clock interface, used in place of pygame.time.Clock
+    def get_ticks(self):
+        return int(self.now)
+
+    def tick(self, framerate=0):
+        now = time.perf_counter()
+        self.frame_times.append(now - self._last)
+        self._last = now
+        elapsed = self._current()[0]
+        self.frame += 1
+        self.now += elapsed
+        return elapsed
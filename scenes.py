@@ -0,0 +1,304 @@
+import os
+import sys
+import gc
+import time
+import types
+import threading
+import pygame
+import assets
+import audio
+
+
+class Scene:
+    """Lifecycle hooks SceneManager calls on every scene switch.
+
+    enter()  -- the scene becomes the active one: start its music
+    exit()   -- it stops being the active one: stop its music and sounds
+    unload() -- release what it loaded (asset cache references, sounds,
+                surfaces it built); the scene is not used again afterwards
+    """
+
+    def enter(self):
+        pass
+
+    def exit(self):
+        pass
+
+    def unload(self):
+        pass
+
+    def cleanup(self):
+        """exit() and unload(), for code that runs a scene without a SceneManager"""
+        self.exit()
+        self.unload()
+
+
+class ScenePreload(threading.Thread):
+    """Runs one scene's preload jobs on a worker thread"""
+
+    def __init__(self, name, jobs):
+        super().__init__(name=f"Preload-{name}", daemon=True)
+        self.scene_name = name
+        self.jobs = list(jobs)
+        self.done = 0
+        self.errors = []
+        self.load_ms = None
+
+    def run(self):
+        start = time.perf_counter()
+        for job in self.jobs:
+            try:
+                job()
+            except Exception as e:
+                # The scene reports (and falls back) again when it loads for real
+                self.errors.append(e)
+            self.done += 1
+        self.load_ms = (time.perf_counter() - start) * 1000
+
+    @property
+    def progress(self):
+        return self.done / len(self.jobs) if self.jobs else 1.0
+
+
+class SceneManager:
+    """Warms the asset cache for the next scene while the current one plays.
+
+    preload() starts the next scene's loads (see Menu.preload_jobs) in the
+    background; the main loop keeps running the current scene until ready()
+    says they are done, then create() builds the scene from cached assets.
+    """
+
+    def __init__(self):
+        self.preloads = {}
+        self.load_times = {}  # name -> {"preload_ms", "create_ms", "jobs", "errors"}
+        self.active = None
+        self.active_name = None
+
+    def preload(self, name, jobs):
+        loader = ScenePreload(name, jobs)
+        self.preloads[name] = loader
+        loader.start()
+        return loader
+
+    def progress(self, name):
+        """0.0 to 1.0; 1.0 for scenes that were never preloaded"""
+        loader = self.preloads.get(name)
+        return loader.progress if loader is not None else 1.0
+
+    def ready(self, name):
+        loader = self.preloads.get(name)
+        return loader is None or not loader.is_alive()
+
+    def wait(self, name):
+        loader = self.preloads.get(name)
+        if loader is not None:
+            loader.join()
+
+    def create(self, name, factory):
+        """Build the scene (waiting for its preload if needed) and record timings"""
+        self.wait(name)
+        start = time.perf_counter()
+        scene = factory()
+        create_ms = (time.perf_counter() - start) * 1000
+        loader = self.preloads.pop(name, None)
+        self.load_times[name] = {
+            "preload_ms": loader.load_ms if loader is not None else None,
+            "create_ms": create_ms,
+            "jobs": len(loader.jobs) if loader is not None else 0,
+            "errors": len(loader.errors) if loader is not None else 0,
+        }
+        return scene
+
+    def switch(self, name, factory):
+        """Leave the active scene, then create and enter the next one"""
+        self.leave()
+        scene = self.create(name, factory)
+        self.active = scene
+        self.active_name = name
+        scene.enter()
+        return scene
+
+    def leave(self):
+        """Exit and unload the active scene, then drop the images nobody holds any more"""
+        scene = self.active
+        if scene is None:
+            return
+        self.active = None
+        self.active_name = None
+        scene.exit()
+        scene.unload()
+        assets.cache.trim()
+
+    def memory_report(self, **owners):
+        """Live surface and sound bytes per owner: the active scene, shared caches, then owners"""
+        roots = {}
+        if self.active is not None:
+            roots[f"scene {self.active_name}"] = self.active
+        roots["asset cache"] = assets.cache
+        roots["sound bank"] = (audio.sfx, assets._sounds)
+        roots.update(owners)
+        return MemoryTracker().report(roots)
+
+    def report(self, name):
+        times = self.load_times.get(name)
+        if times is None:
+            return f"Scene {name}: not loaded"
+        preload = f"{times['preload_ms']:.0f} ms" if times["preload_ms"] is not None else "none"
+        return (f"Scene {name}: preloaded in {preload} ({times['jobs']} jobs, "
+                f"{times['errors']} errors), created in {times['create_ms']:.1f} ms")
+
+
+# Never followed when looking for what an object owns
+NOT_OWNED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+             types.MethodType, types.FrameType, types.CodeType, threading.Thread)
+
+
+def surface_bytes(surface):
+    """Pixel bytes of a surface; subsurfaces share their parent's, see owned_buffer()"""
+    return surface.get_pitch() * surface.get_height()
+
+
+def sound_bytes(sound):
+    init = pygame.mixer.get_init()
+    if init is None:
+        return 0
+    frequency, fmt, channels = init
+    return round(sound.get_length() * frequency) * channels * abs(fmt) // 8
+
+
+class MemoryTracker:
+    """Attributes every live pygame Surface and Sound to an owner.
+
+    Surfaces and Sounds are not tracked by the garbage collector, but every
+    one that is alive is referenced from something that is (an instance's
+    __dict__, a list, a frame's locals), so sweeping gc.get_objects() finds
+    them all. Each is then charged to the first owner it is reachable from
+    through attributes and containers; what no owner reaches is "other".
+    Subsurfaces (atlas sprites) count as the page they live on, and the
+    display surface is not counted at all.
+
+    gc.get_objects() skips objects moved to the permanent generation by
+    gc.freeze() (main.py --gc-freeze), so live() thaws them for the sweep
+    and freezes everything again afterwards.
+    """
+
+    def _buffer(self, obj):
+        """(id, object, bytes) of the memory obj stands for, or None"""
+        if isinstance(obj, pygame.Surface):
+            obj = obj.get_abs_parent()
+            if obj is pygame.display.get_surface():
+                return None
+            return id(obj), obj, surface_bytes(obj)
+        if isinstance(obj, pygame.mixer.Sound):
+            return id(obj), obj, sound_bytes(obj)
+        return None
+
+    def live(self):
+        """{id: (object, bytes)} for every Surface and Sound alive right now"""
+        found = {}
+        stack = []
+        frozen = gc.get_freeze_count()
+        if frozen:
+            gc.unfreeze()
+        try:
+            containers = gc.get_objects()
+        finally:
+            if frozen:
+                gc.freeze()
+        for container in containers:
+            stack.extend(gc.get_referents(container))
+            while stack:
+                obj = stack.pop()
+                buffer = self._buffer(obj)
+                if buffer is not None:
+                    found[buffer[0]] = buffer[1:]
+                elif isinstance(obj, (tuple, list, dict, set, frozenset)) and not gc.is_tracked(obj):
+                    stack.extend(gc.get_referents(obj))  # Untracked, e.g. a tuple of surfaces only
+        return found
+
+    def reachable(self, root):
+        """ids of the Surfaces and Sounds reachable from root"""
+        found = set()
+        seen = set()
+        stack = [root]
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen or isinstance(obj, NOT_OWNED):
+                continue
+            seen.add(id(obj))
+            buffer = self._buffer(obj)
+            if buffer is not None:
+                found.add(buffer[0])
+            elif not isinstance(obj, (pygame.Surface, pygame.mixer.Sound)):
+                stack.extend(gc.get_referents(obj))
+        return found
+
+    def snapshot(self, roots):
+        """{owner: bytes} for roots (name -> object), plus "other" and "total" bytes"""
+        live = self.live()
+        usage = {}
+        claimed = set()
+        for name, root in roots.items():
+            ids = self.reachable(root) - claimed
+            ids &= live.keys()
+            claimed |= ids
+            usage[name] = sum(live[i][1] for i in ids)
+        usage["other"] = sum(nbytes for i, (obj, nbytes) in live.items() if i not in claimed)
+        usage["total"] = sum(nbytes for obj, nbytes in live.values())
+        return usage
+
+    def report(self, roots):
+        return [f"{owner:>16}: {nbytes / 1024:9.1f} KiB" for owner, nbytes in self.snapshot(roots).items()]
+
+
+def check_scene_memory(gc_freeze=False):
+    """Enter and leave each scene; surface and sound memory must return to where it started.
+
+    With gc_freeze the scenes run under loop.GcControl as in main.py
+    --gc-freeze, and the tracker must see the same bytes as without it.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from intro import Intro
+    from menu import Menu
+    from loop import GcControl
+    collector = GcControl()
+    if gc_freeze:
+        collector.start()
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    tracker = MemoryTracker()
+    manager = SceneManager()
+    factories = {
+        "intro": lambda: Intro(screen, 800, 600),
+        "menu": lambda: Menu(screen),
+    }
+    baseline = tracker.snapshot({})["total"]
+    print(f"baseline: {baseline / 1024:.1f} KiB")
+    for name, factory in factories.items():
+        scene = manager.switch(name, factory)
+        collector.transition()
+        for line in manager.memory_report():
+            print(f"  {name} active {line}")
+        if gc_freeze:
+            assert gc.get_freeze_count(), "scene objects were not frozen"
+            frozen = tracker.snapshot({"scene": scene})
+            gc.unfreeze()
+            thawed = tracker.snapshot({"scene": scene})
+            gc.freeze()
+            assert frozen == thawed, f"frozen objects missed: {frozen} vs {thawed}"
+            assert frozen["scene"] > 0, f"{name} owns no surfaces with the GC frozen"
+        del scene
+        manager.leave()
+        collector.transition()
+        left = tracker.snapshot({})["total"]
+        print(f"after leaving {name}: {left / 1024:.1f} KiB")
+        assert left == baseline, f"{name} left {left - baseline} bytes behind"
+    collector.stop()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv:
+        check_scene_memory()
+        check_scene_memory(gc_freeze=True)
@@ -0,0 +1,367 @@
+import sys
+import time
+import heapq
+import numpy as np
+
+# Easing curves map progress 0..1 to 0..1. They are plain polynomials, so the
+# same function eases a float (few tweens) or a whole NumPy array (many).
+EASINGS = {
+    "linear": lambda t: t,
+    "in_quad": lambda t: t * t,
+    "out_quad": lambda t: t * (2 - t),
+    "in_out": lambda t: t * t * (3 - 2 * t),  # Smoothstep
+    "in_cubic": lambda t: t * t * t,
+    "out_cubic": lambda t: 1 - (1 - t) * (1 - t) * (1 - t),
+    "out_back": lambda t: 1 + 2.70158 * (t - 1) * (t - 1) * (t - 1) + 1.70158 * (t - 1) * (t - 1),
+}
+EASING_IDS = {name: i for i, name in enumerate(EASINGS)}
+EASING_FUNCS = list(EASINGS.values())
+
+
+class Tween:
+    """Moves a value from start to end over duration ms.
+
+    apply(value) is called with the eased value on every engine update
+    while the tween runs, and once more with exactly `end` when it
+    finishes. Without apply the value is only read through the engine
+    (Playback.value), which is how many tweens stay vectorized.
+    """
+
+    def __init__(self, duration, start, end, easing="linear", apply=None):
+        if easing not in EASING_IDS:
+            raise ValueError(f"unknown easing {easing!r}")
+        self.duration = max(0.0, float(duration))
+        self.start = float(start)
+        self.end = float(end)
+        self.easing = easing
+        self.apply = apply
+
+    def _schedule(self, engine, playback, at):
+        playback.slots.append(engine._add(playback, len(playback.slots), at, self))
+
+
+class Wait:
+    """Nothing happens for duration ms"""
+
+    def __init__(self, duration):
+        self.duration = max(0.0, float(duration))
+
+    def _schedule(self, engine, playback, at):
+        pass
+
+
+class Call:
+    """Calls fn() once the timeline reaches it"""
+
+    duration = 0.0
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def _schedule(self, engine, playback, at):
+        engine._add_call(playback, at, self.fn)
+
+
+class Sequence:
+    """Runs its items one after another"""
+
+    def __init__(self, *items):
+        self.items = items
+        self.duration = sum(item.duration for item in items)
+
+    def _schedule(self, engine, playback, at):
+        for item in self.items:
+            item._schedule(engine, playback, at)
+            at += item.duration
+
+
+class Parallel:
+    """Starts all its items together; lasts as long as the longest"""
+
+    def __init__(self, *items):
+        self.items = items
+        self.duration = max((item.duration for item in items), default=0.0)
+
+    def _schedule(self, engine, playback, at):
+        for item in self.items:
+            item._schedule(engine, playback, at)
+
+
+class Playback:
+    """One timeline playing on a TweenEngine, from TweenEngine.play()"""
+
+    def __init__(self, engine, start, duration):
+        self.engine = engine
+        self.start = start
+        self.end = start + duration
+        self.slots = []  # Engine slot per Tween in schedule order, None once finished
+        self.stopped = False
+
+    @property
+    def finished(self):
+        return self.stopped or self.engine.now >= self.end
+
+    def value(self, index=0):
+        """Current value of the index-th Tween of the timeline (schedule order)"""
+        slot = self.slots[index]
+        if slot is None:
+            return self._ends[index]
+        return float(self.engine.values[slot]) if self.engine.evaluated[slot] else self._starts[index]
+
+    def stop(self):
+        """Drop the remaining tweens and calls without applying their end values"""
+        if self.stopped:
+            return
+        self.stopped = True
+        for slot in self.slots:
+            if slot is not None:
+                self.engine._free(slot)
+
+
+class TweenEngine:
+    """Evaluates every running tween of every timeline in one update(now).
+
+    Tweens live in slots of preallocated arrays (start, end, 1/duration,
+    from, to, easing), like effects.EffectPool, and the arrays grow when
+    they fill up. With fewer than vector_min tweens running, update() walks
+    them in plain Python, which is cheaper than a dozen NumPy calls on tiny
+    arrays; from vector_min on, progress, easing and values are computed
+    for all of them at once and only tweens with an apply callback cost a
+    Python call each. Calls fire after the tween values of the same update,
+    in timeline order.
+
+    Within one update, tweens that finished are applied before running
+    ones, so consecutive tweens of a Sequence driving the same value hand
+    over in the right order.
+    """
+
+    def __init__(self, capacity=256, vector_min=64):
+        self.vector_min = vector_min
+        self.now = 0.0
+        self.count = 0
+        self.size = 0  # Slots ever used; the live ones are below this
+        self._free_slots = []
+        self._records = {}  # slot -> (start, end, inv_duration, from, to - from, to, ease, apply, playback, index)
+        self._calls = []  # Heap of (time, order, playback, fn)
+        self._call_order = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        old = getattr(self, "capacity", 0)
+        self.capacity = capacity
+
+        def grow(array, dtype):
+            new = np.zeros(capacity, dtype)
+            if array is not None:
+                new[:old] = array[:old]
+            return new
+
+        get = lambda name: getattr(self, name, None)
+        self.start = grow(get("start"), np.float64)
+        self.end = grow(get("end"), np.float64)
+        self.inv_duration = grow(get("inv_duration"), np.float64)
+        self.a = grow(get("a"), np.float64)
+        self.delta = grow(get("delta"), np.float64)  # to - from
+        self.easing = grow(get("easing"), np.int8)
+        self.live = grow(get("live"), np.bool_)
+        self.bound = grow(get("bound"), np.bool_)
+        self.evaluated = grow(get("evaluated"), np.bool_)  # Has a value from an update since it started
+        self.values = grow(get("values"), np.float64)
+        # Scratch buffers reused every update
+        self._progress = np.zeros(capacity, np.float64)
+        self._started = np.zeros(capacity, np.bool_)
+        self._finished = np.zeros(capacity, np.bool_)
+        self._mask = np.zeros(capacity, np.bool_)
+        self._appliers = get("_appliers") or []
+        self._appliers.extend([None] * (capacity - len(self._appliers)))
+
+    def play(self, timeline, now=None):
+        """Schedule a timeline (Tween, Wait, Call, Sequence or Parallel) to start at now"""
+        playback = Playback(self, self.now if now is None else now, timeline.duration)
+        timeline._schedule(self, playback, playback.start)
+        playback._starts = [self._records[slot][3] for slot in playback.slots]
+        playback._ends = [self._records[slot][5] for slot in playback.slots]
+        return playback
+
+    def _add(self, playback, index, at, tween):
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self.size == self.capacity:
+                self._allocate(self.capacity * 2)
+            slot = self.size
+            self.size += 1
+        inv = 1 / tween.duration if tween.duration else 0.0
+        ease = EASING_FUNCS[EASING_IDS[tween.easing]]
+        delta = tween.end - tween.start
+        self.start[slot] = at
+        self.end[slot] = at + tween.duration
+        self.inv_duration[slot] = inv
+        self.a[slot] = tween.start
+        self.delta[slot] = delta
+        self.easing[slot] = EASING_IDS[tween.easing]
+        self.live[slot] = True
+        self.bound[slot] = tween.apply is not None
+        self.evaluated[slot] = False
+        self._appliers[slot] = tween.apply
+        self._records[slot] = (at, at + tween.duration, inv, tween.start, delta, tween.end, ease, tween.apply,
+                               playback, index)
+        self.count += 1
+        return slot
+
+    def _add_call(self, playback, at, fn):
+        heapq.heappush(self._calls, (at, self._call_order, playback, fn))
+        self._call_order += 1
+
+    def _free(self, slot):
+        record = self._records.pop(slot)
+        record[8].slots[record[9]] = None
+        self.live[slot] = False
+        self.bound[slot] = False
+        self._appliers[slot] = None
+        self._free_slots.append(slot)
+        self.count -= 1
+
+    def clear(self):
+        """Stop every playback"""
+        for record in list(self._records.values()):
+            record[8].stop()
+        self._calls.clear()
+
+    def update(self, now):
+        """Evaluate all tweens at time now, then fire the calls that are due"""
+        self.now = now
+        if self.count:
+            if self.count < self.vector_min:
+                self._update_python(now)
+            else:
+                self._update_vector(now)
+        calls = self._calls
+        while calls and calls[0][0] <= now:
+            _, _, playback, fn = heapq.heappop(calls)
+            if not playback.stopped:
+                fn()
+
+    def _update_python(self, now):
+        finished = []
+        running = []
+        for slot in sorted(self._records):  # Slot order, like the NumPy path
+            start, end, inv, a, delta, b, ease, apply, playback, index = self._records[slot]
+            if now < start:
+                continue
+            if now >= end:
+                finished.append((slot, b, apply))
+                continue
+            progress = min(1.0, (now - start) * inv)
+            value = a + delta * ease(progress)
+            self.values[slot] = value
+            self.evaluated[slot] = True
+            if apply is not None:
+                running.append((apply, value))
+        for slot, value, apply in finished:
+            self.values[slot] = value
+            self._free(slot)
+            if apply is not None:
+                apply(value)
+        for apply, value in running:
+            apply(value)
+
+    def _update_vector(self, now):
+        n = self.size
+        live = self.live[:n]
+        started = self._started[:n]
+        np.less_equal(self.start[:n], now, out=started)
+        np.logical_and(started, live, out=started)
+        finished = self._finished[:n]
+        np.less_equal(self.end[:n], now, out=finished)
+        np.logical_and(finished, live, out=finished)
+        progress = self._progress[:n]
+        np.subtract(now, self.start[:n], out=progress)
+        np.multiply(progress, self.inv_duration[:n], out=progress)
+        np.clip(progress, 0.0, 1.0, out=progress)
+        progress[finished] = 1.0  # Zero-length tweens too
+        easing = self.easing[:n]
+        mask = self._mask[:n]
+        for easing_id in np.unique(easing[started]).tolist():
+            if easing_id:  # 0 is linear
+                np.equal(easing, easing_id, out=mask)
+                progress[mask] = EASING_FUNCS[easing_id](progress[mask])
+        values = self.values[:n]
+        np.multiply(self.delta[:n], progress, out=values)
+        np.add(values, self.a[:n], out=values)
+        self.evaluated[:n] |= started
+        done = np.flatnonzero(finished).tolist()
+        np.logical_and(started, self.bound[:n], out=mask)
+        np.greater(mask, finished, out=mask)  # And not finished
+        running = np.flatnonzero(mask).tolist()
+        appliers = self._appliers
+        for slot in done:
+            apply = appliers[slot]
+            value = values[slot] = self._records[slot][5]  # Exactly `to`
+            self._free(slot)
+            if apply is not None:
+                apply(value)
+        if running:
+            for slot, value in zip(running, values[running].tolist()):
+                appliers[slot](value)
+
+
+def bench_tweens(counts=(10, 100, 1000, 10000), frames=120):
+    """Per-frame cost of N concurrent tweens in the Python and the NumPy path"""
+    frame_ms = 1000 / 60
+    sink = [0.0]
+    def store(value):
+        sink[0] = value
+    names = list(EASINGS)
+    for count in counts:
+        results = {}
+        for path, vector_min in (("python", sys.maxsize), ("numpy", 0)):
+            for bound in (False, True):
+                engine = TweenEngine(vector_min=vector_min)
+                now = 1.0
+                # Tweens of staggered lengths, each replaced by a new one as it ends
+                def spawn(i, at):
+                    engine.play(Sequence(Tween(500 + i % 1000, 0, 100, names[i % len(names)],
+                                               apply=store if bound else None),
+                                         Call(lambda: spawn(i, engine.now))), at)
+                for i in range(count):
+                    spawn(i, now)
+                elapsed = 0.0
+                for frame in range(frames):
+                    start = time.perf_counter()
+                    engine.update(now)
+                    elapsed += time.perf_counter() - start
+                    now += frame_ms
+                results[path, bound] = elapsed * 1000 / frames
+        print(f"{count:6d} tweens: values only python {results['python', False]:8.3f} ms, "
+              f"numpy {results['numpy', False]:7.3f} ms | with apply() python {results['python', True]:8.3f} ms, "
+              f"numpy {results['numpy', True]:7.3f} ms")
+
+
+def check_paths(count=500, frames=90):
+    """Both update paths must produce the same values and callback order"""
+    names = list(EASINGS)
+    logs = []
+    for vector_min in (sys.maxsize, 0):
+        engine = TweenEngine(capacity=8, vector_min=vector_min)  # Small, to exercise growing
+        log = []
+        playbacks = []
+        for i in range(count):
+            timeline = Sequence(Wait(i % 7 * 20),
+                                Tween(i % 5 * 100, i, -i, names[i % len(names)], apply=lambda v, i=i: log.append((i, v))),
+                                Call(lambda i=i: log.append((i, "done"))),
+                                Tween(200, 0, 1))
+            playbacks.append(engine.play(timeline, 1.0))
+        for frame in range(frames):
+            engine.update(1.0 + frame * 1000 / 60)
+            log.append(tuple(playback.value(1) for playback in playbacks[:20]))
+        logs.append(log)
+    assert logs[0] == logs[1], "python and numpy paths disagree"
+    print(f"{count} timelines, {frames} frames: both paths agree ({len(logs[0])} log entries)")
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv:
+        check_paths()
+    if "--bench" in sys.argv:
+        bench_tweens()
@@ -0,0 +1,163 @@
+import os
+import sys
+import time
+import random
+import pygame
+
+
+class HitRegion:
+    """One clickable area: a rect, optionally narrowed to the opaque pixels of its art"""
+    __slots__ = ("key", "rect", "mask", "order")
+
+    def __init__(self, key, rect, mask=None, order=0):
+        self.key = key
+        self.rect = pygame.Rect(rect)
+        self.mask = mask
+        self.order = order  # Higher is on top
+
+    def contains(self, pos):
+        if not self.rect.collidepoint(pos):
+            return False
+        if self.mask is None:
+            return True
+        return bool(self.mask.get_at((pos[0] - self.rect.x, pos[1] - self.rect.y)))
+
+
+class HitIndex:
+    """Clickable regions bucketed in a uniform grid, built once per layout.
+
+    A lookup only tests the regions overlapping the grid cell under the
+    cursor, so it costs the same for five title buttons as for hundreds of
+    cards on a deck-edit screen. Regions registered with the image they are
+    drawn with get a per-pixel mask, so the transparent corners of irregular
+    button art do not react.
+
+    update_hover() is meant for MOUSEMOTION events: the hovered region only
+    changes when the cursor moves, never by scanning widgets every frame.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.regions = {}  # key -> HitRegion
+        self.cells = {}  # (cx, cy) -> [HitRegion], topmost first
+        self.hovered = None
+        self._next_order = 0
+
+    def _cells_for(self, rect):
+        size = self.cell_size
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield (cx, cy)
+
+    def add(self, key, rect, image=None, alpha_threshold=127):
+        """Register a region; later regions are on top of earlier ones"""
+        if key in self.regions:
+            self.remove(key)
+        mask = None
+        if image is not None and image.get_flags() & pygame.SRCALPHA:
+            mask = pygame.mask.from_surface(image, alpha_threshold)
+        region = HitRegion(key, rect, mask, self._next_order)
+        self._next_order += 1
+        self.regions[key] = region
+        for cell in self._cells_for(region.rect):
+            bucket = self.cells.setdefault(cell, [])
+            bucket.append(region)
+            bucket.sort(key=lambda r: r.order, reverse=True)
+        return region
+
+    def remove(self, key):
+        region = self.regions.pop(key, None)
+        if region is None:
+            return
+        for cell in self._cells_for(region.rect):
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.remove(region)
+                if not bucket:
+                    del self.cells[cell]
+        if self.hovered == key:
+            self.hovered = None
+
+    def clear(self):
+        self.regions.clear()
+        self.cells.clear()
+        self.hovered = None
+
+    def at(self, pos):
+        """Key of the topmost region under pos, or None"""
+        bucket = self.cells.get((pos[0] // self.cell_size, pos[1] // self.cell_size))
+        if bucket is None:
+            return None
+        for region in bucket:
+            if region.contains(pos):
+                return region.key
+        return None
+
+    def update_hover(self, pos):
+        """Move the hover to whatever is under pos; returns True if it changed"""
+        hovered = self.at(pos)
+        if hovered == self.hovered:
+            return False
+        self.hovered = hovered
+        return True
+
+
+class EventRouter:
+    """Sends each pygame event to the active scene's handle_event().
+
+    Handlers registered with on() run first for their event type (e.g. F3 for
+    the profiler overlay); a handler returning True consumes the event. Scenes
+    without a handle_event() (the intro) simply receive nothing.
+    """
+
+    def __init__(self):
+        self.scene = None
+        self.handlers = {}  # event type -> [handler(event)]
+
+    def set_scene(self, scene):
+        self.scene = scene
+
+    def on(self, event_type, handler):
+        self.handlers.setdefault(event_type, []).append(handler)
+
+    def dispatch(self, event):
+        """Route one event; returns what the scene returned (e.g. a MenuState)"""
+        for handler in self.handlers.get(event.type, ()):
+            if handler(event):
+                return None
+        handle_event = getattr(self.scene, "handle_event", None)
+        if handle_event is None:
+            return None
+        return handle_event(event)
+
+
+def bench_hit_test(widgets=(5, 100, 500), lookups=20000):
+    """Lookup cost of the grid index against a linear scan over fresh Rects"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    rng = random.Random(1)
+    for count in widgets:
+        rects = [pygame.Rect(rng.randrange(760), rng.randrange(560), 40, 40) for _ in range(count)]
+        index = HitIndex()
+        for i, rect in enumerate(rects):
+            index.add(i, rect)
+        points = [(rng.randrange(800), rng.randrange(600)) for _ in range(lookups)]
+
+        start = time.perf_counter()
+        for pos in points:
+            for i, rect in enumerate(rects):
+                if pygame.Rect(rect.topleft, rect.size).collidepoint(pos):
+                    break
+        linear = (time.perf_counter() - start) * 1e6 / lookups
+
+        start = time.perf_counter()
+        for pos in points:
+            index.at(pos)
+        indexed = (time.perf_counter() - start) * 1e6 / lookups
+        print(f"{count:4d} widgets: linear {linear:6.2f} us, grid {indexed:5.2f} us per lookup")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        bench_hit_test()